@@ -0,0 +1,177 @@
+"""
+Local overload demonstration for registration_server.py.
+
+Starts the endpoint in-process twice — once with admission control disabled,
+once enabled — and drives each with the same mix:
+
+  - legitimate users: many distinct client IPs, each submitting a fresh,
+    valid registration every --legit-interval seconds,
+  - bots: a few client IPs hammering the endpoint in a closed loop, retrying
+    the same handful of emails immediately after every response.
+
+Client IPs are simulated with X-Forwarded-For (the server runs with
+trusted_proxies=1). The backend is a pool of --backend-workers slots held for
+--work-ms each, so bot traffic without admission control queues in front of
+real users. Prints legitimate p50/p99 latency and success rate for both runs.
+
+Usage:
+    python admission_load_test.py --duration 5
+"""
+
+import argparse
+import http.client
+import json
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from latency_histogram import LatencyHistogram, merged
+from registration_server import AdmissionController, make_server
+
+VALID_PAYLOAD = {
+    "firstName": "Vishnu",
+    "lastName": "Thammadaveni",
+    "country": "IN",
+    "state": "Telangana",
+    "city": "Hyderabad",
+    "phoneCode": "+91",
+    "phone": "+919876543210",
+    "password": "Vishnu@#9908",
+}
+
+
+def _client(port: int, ip: str, emails: List[str], stop: threading.Event, interval: float,
+            hist: LatencyHistogram, statuses: Dict[int, int]) -> None:
+    """Send registrations from one simulated client until stop is set."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    n = 0
+    while not stop.is_set():
+        payload = dict(VALID_PAYLOAD, email=emails[n % len(emails)])
+        n += 1
+        body = json.dumps(payload)
+        started = time.perf_counter()
+        try:
+            conn.request(
+                "POST",
+                "/register",
+                body=body,
+                headers={"Content-Type": "application/json", "X-Forwarded-For": ip},
+            )
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            status = 0
+        hist.record(time.perf_counter() - started)
+        statuses[status] = statuses.get(status, 0) + 1
+        if interval:
+            stop.wait(interval)
+    conn.close()
+
+
+def run_scenario(admission: AdmissionController, args: argparse.Namespace) -> dict:
+    """Run one load mix against a fresh in-process server and summarise it."""
+    with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=True) as store:
+        server = make_server(
+            port=0,
+            admission=admission,
+            store_path=store.name,
+            backend_workers=args.backend_workers,
+            work_ms=args.work_ms,
+            trusted_proxies=1,
+        )
+        port = server.server_address[1]
+        serving = threading.Thread(target=server.serve_forever, daemon=True)
+        serving.start()
+
+        stop = threading.Event()
+        threads = []
+        legit = {"hist": [], "statuses": []}
+        bots = {"hist": [], "statuses": []}
+
+        for i in range(args.legit_clients):
+            hist, statuses = LatencyHistogram(), {}
+            legit["hist"].append(hist)
+            legit["statuses"].append(statuses)
+            emails = [f"user{i}.{k}@example.com" for k in range(10_000)]
+            threads.append(threading.Thread(
+                target=_client,
+                args=(port, f"10.1.{i // 250}.{i % 250 + 1}", emails, stop, args.legit_interval, hist, statuses),
+            ))
+        for i in range(args.bot_threads):
+            hist, statuses = LatencyHistogram(), {}
+            bots["hist"].append(hist)
+            bots["statuses"].append(statuses)
+            emails = [f"bot{k}@example.com" for k in range(3)]
+            threads.append(threading.Thread(
+                target=_client,
+                args=(port, f"203.0.113.{i % args.bot_ips + 1}", emails, stop, 0.0, hist, statuses),
+            ))
+
+        for t in threads:
+            t.start()
+        time.sleep(args.duration)
+        stop.set()
+        for t in threads:
+            t.join()
+        server_metrics = server.metrics.snapshot()
+        server.shutdown()
+        server.server_close()
+
+    def summarise(group: dict) -> dict:
+        statuses: Dict[int, int] = {}
+        for s in group["statuses"]:
+            for code, n in s.items():
+                statuses[code] = statuses.get(code, 0) + n
+        total = sum(statuses.values())
+        return {
+            "requests": total,
+            "ok_rate": round(statuses.get(201, 0) / total, 3) if total else 0.0,
+            "statuses": dict(sorted(statuses.items())),
+            "latency": merged(group["hist"]).summary(),
+        }
+
+    return {"legit": summarise(legit), "bots": summarise(bots), "server": server_metrics["counters"]}
+
+
+def main() -> None:
+    """Compare legitimate-user latency with and without admission control."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--legit-clients", type=int, default=20)
+    parser.add_argument("--legit-interval", type=float, default=0.25, help="seconds between a user's submits")
+    parser.add_argument("--bot-threads", type=int, default=24)
+    parser.add_argument("--bot-ips", type=int, default=4)
+    parser.add_argument("--backend-workers", type=int, default=8)
+    parser.add_argument("--work-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    scenarios = {
+        "no admission control": AdmissionController.disabled(),
+        "admission control": AdmissionController(ip_rate=5, ip_burst=10, email_rate=0.2, email_burst=3,
+                                                  max_in_flight=args.backend_workers * 2),
+    }
+    results = {}
+    for name, admission in scenarios.items():
+        print(f"Running '{name}' for {args.duration:g}s ...")
+        results[name] = run_scenario(admission, args)
+
+    print("\nLegitimate users:")
+    for name, res in results.items():
+        lat = res["legit"]["latency"]
+        print(f" - {name:22s} ok={res['legit']['ok_rate']:.1%} p50={lat['p50_ms']}ms "
+              f"p99={lat['p99_ms']}ms p99.9={lat['p999_ms']}ms (n={lat['count']})")
+    print("Bots:")
+    for name, res in results.items():
+        lat = res["bots"]["latency"]
+        print(f" - {name:22s} statuses={res['bots']['statuses']} p50={lat['p50_ms']}ms p99={lat['p99_ms']}ms")
+    print("Server counters:")
+    for name, res in results.items():
+        print(f" - {name:22s} {res['server']}")
+
+
+if __name__ == "__main__":
+    main()
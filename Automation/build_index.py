@@ -0,0 +1,194 @@
+"""
+Build step: pre-render the country and phone-code options into index.html.
+
+On DOMContentLoaded, populateCountries() in script.js creates one <option> per
+country for both #country and #phoneCode. This script renders those options
+(plus the empty #state / #city placeholders) straight from DATA into a
+generated index.html, so the browser parses them with the document. At
+runtime populateCountries() sees the options already match DATA and only
+resets the selection instead of rebuilding them.
+
+Output goes to dist/ (index.html plus copies of data.js, script.js and
+index.css), leaving the hand-edited index.html untouched. Re-run after editing
+data.js; if the lists no longer match, script.js simply rebuilds them.
+
+--measure loads the plain and the pre-rendered page in headless Chrome and
+reports time to DOMContentLoaded end (when the page becomes interactive),
+optionally with a synthetic full-size country list (--countries 250).
+
+Usage:
+    python build_index.py                    # writes ../dist/
+    python build_index.py --out /tmp/site
+    python build_index.py --measure --countries 250 --runs 20
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import shutil
+import statistics
+import tempfile
+from typing import Dict, List
+
+from data_loader import DATA_JS, load_data
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DIST = os.path.join(ROOT, "dist")
+ASSETS = ("data.js", "script.js", "index.css")
+
+PLACEHOLDERS = {
+    "country": "-- Select Country --",
+    "phoneCode": "-- Select Code --",
+    "state": "-- Select State --",
+    "city": "-- Select City --",
+}
+
+_SELECT_RE = re.compile(r'(<select\s+id="(?P<id>country|phoneCode|state|city)"[^>]*>)\s*</select>')
+
+
+def _option(value: str, text: str) -> str:
+    """One escaped <option> element."""
+    return f'<option value="{html.escape(value)}">{html.escape(text)}</option>'
+
+
+def render_options(data: dict) -> Dict[str, List[str]]:
+    """<option> markup per select id, matching what script.js would build."""
+    options = {sid: [_option("", text)] for sid, text in PLACEHOLDERS.items()}
+    for c in data["countries"]:
+        options["country"].append(_option(c["code"], c["name"]))
+        options["phoneCode"].append(_option(c["phoneCode"], f"{c['name']} ({c['phoneCode']})"))
+    return options
+
+
+def prerender(index_html: str, data: dict) -> str:
+    """Return index_html with the empty selects filled from data."""
+    options = render_options(data)
+    found = set()
+
+    def fill(match: "re.Match") -> str:
+        found.add(match.group("id"))
+        indent = " " * 12
+        body = "".join(f"\n{indent}{opt}" for opt in options[match.group("id")])
+        return f"{match.group(1)}{body}\n{indent[:-2]}</select>"
+
+    rendered = _SELECT_RE.sub(fill, index_html)
+    missing = set(PLACEHOLDERS) - found
+    if missing:
+        raise ValueError(f"index.html has no empty <select> for: {', '.join(sorted(missing))}")
+    return rendered
+
+
+def build(out_dir: str = DIST, source_dir: str = ROOT, data_path: str = DATA_JS) -> str:
+    """Write the pre-rendered site into out_dir and return the index.html path."""
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(source_dir, "index.html"), "r", encoding="utf-8") as fh:
+        page = prerender(fh.read(), load_data(data_path))
+    for name in ASSETS:
+        src = data_path if name == "data.js" else os.path.join(source_dir, name)
+        shutil.copyfile(src, os.path.join(out_dir, name))
+    index_path = os.path.join(out_dir, "index.html")
+    with open(index_path, "w", encoding="utf-8") as fh:
+        fh.write(page)
+    return index_path
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def synthetic_data(data: dict, countries: int) -> dict:
+    """DATA padded with generated countries up to the requested count."""
+    padded = {**data, "countries": list(data["countries"])}
+    n = 0
+    while len(padded["countries"]) < countries:
+        n += 1
+        padded["countries"].append({
+            "code": f"Z{n:03d}",
+            "name": f"Country {n:03d}",
+            "phoneCode": f"+{900 + n}",
+            "states": [{"name": f"Region {n}", "cities": [f"City {n}-{k}" for k in range(10)]}],
+        })
+    return padded
+
+
+def _write_data_js(data: dict, path: str) -> None:
+    """Write data as a data.js file that script.js can load."""
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("const DATA = " + json.dumps(data, indent=2) + ";\n")
+
+
+def _time_to_interactive(driver, url: str, runs: int) -> List[float]:
+    """Milliseconds from navigation start to DOMContentLoaded end, per run."""
+    samples = []
+    for _ in range(runs):
+        driver.get(url)
+        ms = driver.execute_script(
+            "const n = performance.getEntriesByType('navigation')[0];"
+            "return n ? n.domContentLoadedEventEnd - n.startTime : null;"
+        )
+        if ms is not None:
+            samples.append(float(ms))
+    return samples
+
+
+def measure(countries: int, runs: int) -> None:
+    """Compare the plain page against the pre-rendered build in headless Chrome."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    from driver_resolver import resolve_chromedriver
+
+    data = load_data()
+    if countries > len(data["countries"]):
+        data = synthetic_data(data, countries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data.js")
+        _write_data_js(data, data_path)
+
+        plain = os.path.join(tmp, "plain")
+        os.makedirs(plain)
+        for name in ("index.html", "script.js", "index.css"):
+            shutil.copyfile(os.path.join(ROOT, name), os.path.join(plain, name))
+        shutil.copyfile(data_path, os.path.join(plain, "data.js"))
+        prerendered = os.path.dirname(build(os.path.join(tmp, "prerendered"), ROOT, data_path))
+
+        opts = Options()
+        opts.add_argument("--headless=new")
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=opts)
+        try:
+            print(f"{len(data['countries'])} countries, {runs} loads each")
+            for label, folder in (("runtime-built", plain), ("pre-rendered", prerendered)):
+                url = "file://" + os.path.join(folder, "index.html")
+                _time_to_interactive(driver, url, 2)  # warm up the cache
+                samples = _time_to_interactive(driver, url, runs)
+                if not samples:
+                    print(f" - {label:13s}: no navigation timing available")
+                    continue
+                print(f" - {label:13s}: DOMContentLoaded end median {statistics.median(samples):.1f} ms, "
+                      f"min {min(samples):.1f} ms, max {max(samples):.1f} ms")
+        finally:
+            driver.quit()
+
+
+def main() -> None:
+    """Build dist/ (default) or measure the time-to-interactive difference."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=DIST, help="output directory")
+    parser.add_argument("--measure", action="store_true", help="compare load timing in headless Chrome")
+    parser.add_argument("--countries", type=int, default=0, help="pad DATA to this many countries for --measure")
+    parser.add_argument("--runs", type=int, default=15, help="page loads per variant for --measure")
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.countries, args.runs)
+        return
+    path = build(args.out)
+    print("Pre-rendered page written to:", path)
+
+
+if __name__ == "__main__":
+    main()
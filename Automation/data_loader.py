@@ -0,0 +1,41 @@
+"""
+Load the front-end `DATA` object (data.js) into Python.
+
+data.js is a plain JavaScript object literal (unquoted keys, // comments), so
+it is converted to JSON with a couple of regex passes rather than executing
+any JavaScript. The parsed result is cached per path and mtime.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Tuple
+
+DATA_JS = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data.js"))
+
+_COMMENT_RE = re.compile(r'("(?:[^"\\]|\\.)*")|//[^\n]*|/\*.*?\*/', re.S)
+_KEY_RE = re.compile(r"([{,]\s*)([A-Za-z_$][\w$]*)\s*:")
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+_cache: Dict[Tuple[str, int], dict] = {}
+
+
+def parse_data_js(source: str) -> dict:
+    """Convert the text of data.js into the equivalent Python dict."""
+    start = source.index("{")
+    end = source.rindex("}") + 1
+    body = source[start:end]
+    # drop comments but keep anything inside string literals untouched
+    body = _COMMENT_RE.sub(lambda m: m.group(1) or "", body)
+    body = _KEY_RE.sub(r'\1"\2":', body)
+    body = _TRAILING_COMMA_RE.sub(r"\1", body)
+    return json.loads(body)
+
+
+def load_data(path: str = DATA_JS) -> dict:
+    """Return the parsed DATA object from path (cached until the file changes)."""
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _cache:
+        with open(path, "r", encoding="utf-8") as fh:
+            _cache[key] = parse_data_js(fh.read())
+    return _cache[key]
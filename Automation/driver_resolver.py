@@ -0,0 +1,266 @@
+"""
+Chromedriver resolution for the Automation scripts (offline first).
+
+`Service(ChromeDriverManager().install())` performs a network version check on
+every run, which is slow and fails on air-gapped CI machines. This module
+finds a chromedriver that matches the installed Chrome without touching the
+network:
+
+  1. CHROMEDRIVER_PATH environment override
+  2. Local driver cache (CHROMEDRIVER_CACHE_DIR, default
+     ~/.cache/registration-automation/chromedriver/<version>/) and the
+     webdriver-manager cache (~/.wdm) left behind by earlier runs
+  3. chromedriver on PATH
+
+Every candidate is checked against the browser's major version. Versions are
+read from `<binary> --version` once and remembered in a fingerprint file keyed
+by path, size and mtime, so later runs skip the subprocess calls entirely.
+
+webdriver-manager is only used as a last resort when explicitly allowed
+(`allow_download=True` or CHROMEDRIVER_ALLOW_DOWNLOAD=1).
+
+Usage:
+    from driver_resolver import resolve_chromedriver
+    service = Service(resolve_chromedriver())
+
+Run this file directly to print the resolved driver and timing.
+"""
+
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+CACHE_DIR = os.environ.get(
+    "CHROMEDRIVER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "registration-automation", "chromedriver"),
+)
+FINGERPRINT_FILE = os.path.join(CACHE_DIR, "fingerprints.json")
+WDM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver")
+
+DRIVER_NAME = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+
+BROWSER_COMMANDS = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+)
+BROWSER_PATHS = (
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+
+class DriverResolutionError(RuntimeError):
+    """Raised when no usable chromedriver can be found."""
+
+
+def _env_flag(name: str) -> bool:
+    """Return True if the environment variable is set to a truthy value."""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _load_fingerprints() -> Dict[str, dict]:
+    """Read the fingerprint cache; an unreadable file is treated as empty."""
+    try:
+        with open(FINGERPRINT_FILE, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_fingerprints(fingerprints: Dict[str, dict]) -> None:
+    """Persist the fingerprint cache atomically (best effort)."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = FINGERPRINT_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(fingerprints, fh, indent=2, sort_keys=True)
+        os.replace(tmp, FINGERPRINT_FILE)
+    except OSError as e:
+        print("Fingerprint cache save failed:", e)
+
+
+def version_key(text: str) -> Tuple[int, ...]:
+    """Numeric sort key for the last dotted version in text (() if there is none)."""
+    found = _VERSION_RE.findall(text)
+    return tuple(int(part) for part in found[-1]) if found else ()
+
+
+def _probe_version(binary: str) -> str:
+    """Run `<binary> --version` and return the dotted version, or ''."""
+    try:
+        out = subprocess.run(
+            [binary, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=False,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    match = _VERSION_RE.search(out or "")
+    if match:
+        return match.group(0)
+    # chrome.exe on Windows prints nothing; its version is the sibling folder name
+    try:
+        siblings = os.listdir(os.path.dirname(binary))
+    except OSError:
+        return ""
+    versions = [e for e in siblings if _VERSION_RE.fullmatch(e)]
+    return max(versions, key=version_key) if versions else ""
+
+
+def binary_version(binary: str, fingerprints: Dict[str, dict]) -> str:
+    """Return the version of binary, using the fingerprint cache when it is still valid."""
+    path = os.path.abspath(binary)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    entry = fingerprints.get(path)
+    if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+        return entry.get("version", "")
+    version = _probe_version(path)
+    if version:
+        fingerprints[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "version": version}
+    else:
+        # a timed-out or unparseable probe may succeed next run; don't pin the failure
+        fingerprints.pop(path, None)
+    return version
+
+
+def major(version: str) -> str:
+    """Return the major component of a dotted version ('' if unknown)."""
+    return version.split(".", 1)[0] if version else ""
+
+
+def find_browser() -> Optional[str]:
+    """Locate the installed Chrome/Chromium binary (CHROME_BINARY overrides)."""
+    override = os.environ.get("CHROME_BINARY")
+    if override and os.path.isfile(override):
+        return override
+    for cmd in BROWSER_COMMANDS:
+        found = shutil.which(cmd)
+        if found:
+            return found
+    for path in BROWSER_PATHS:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _candidates() -> Iterator[Tuple[str, str]]:
+    """Yield (source, path) pairs for every chromedriver worth checking, in priority order."""
+    override = os.environ.get("CHROMEDRIVER_PATH")
+    if override:
+        yield "env", override
+
+    # newest versions first so a stale driver never shadows a fresh one
+    for pattern in (
+        os.path.join(CACHE_DIR, "*", DRIVER_NAME),
+        os.path.join(WDM_CACHE_DIR, "**", DRIVER_NAME),
+    ):
+        for path in sorted(glob.glob(pattern, recursive=True), key=version_key, reverse=True):
+            yield "cache", path
+
+    on_path = shutil.which(DRIVER_NAME)
+    if on_path:
+        yield "PATH", on_path
+
+
+def _download(verbose: bool) -> str:
+    """Fall back to webdriver-manager (network access required)."""
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError as e:
+        raise DriverResolutionError("webdriver-manager is not installed") from e
+    if verbose:
+        print("No matching local chromedriver; downloading via webdriver-manager ...")
+    return ChromeDriverManager().install()
+
+
+def resolve_chromedriver(allow_download: Optional[bool] = None, verbose: bool = True) -> str:
+    """Return the path of a chromedriver matching the installed browser.
+
+    allow_download defaults to the CHROMEDRIVER_ALLOW_DOWNLOAD environment flag.
+    Raises DriverResolutionError when nothing suitable is found offline and
+    downloading is not allowed.
+    """
+    start = time.perf_counter()
+    if allow_download is None:
+        allow_download = _env_flag("CHROMEDRIVER_ALLOW_DOWNLOAD")
+
+    fingerprints = _load_fingerprints()
+    before = json.dumps(fingerprints, sort_keys=True)
+
+    browser = find_browser()
+    browser_major = major(binary_version(browser, fingerprints)) if browser else ""
+    if verbose and not browser_major:
+        print("Could not determine Chrome version; accepting the first working chromedriver.")
+
+    resolved = None
+    source = ""
+    seen = set()
+    for source, path in _candidates():
+        path = os.path.abspath(path)
+        if path in seen:
+            continue
+        if not os.path.isfile(path) or not os.access(path, os.X_OK):
+            if verbose and source == "env":
+                print(f"CHROMEDRIVER_PATH {path} is missing or not executable; ignoring.")
+            continue
+        seen.add(path)
+        driver_major = major(binary_version(path, fingerprints))
+        if not driver_major:
+            if verbose and source == "env":
+                print(f"CHROMEDRIVER_PATH {path} did not report a version; ignoring.")
+            continue
+        if browser_major and driver_major != browser_major:
+            if verbose and source == "env":
+                print(f"CHROMEDRIVER_PATH is chromedriver {driver_major}, Chrome is {browser_major}; ignoring.")
+            continue
+        resolved = path
+        break
+
+    if json.dumps(fingerprints, sort_keys=True) != before:
+        _save_fingerprints(fingerprints)
+
+    if resolved is None:
+        if not allow_download:
+            raise DriverResolutionError(
+                "No chromedriver matching Chrome "
+                f"{browser_major or '(unknown)'} found via CHROMEDRIVER_PATH, {CACHE_DIR} or PATH. "
+                "Set CHROMEDRIVER_ALLOW_DOWNLOAD=1 to let webdriver-manager fetch one."
+            )
+        source = "webdriver-manager"
+        resolved = _download(verbose)
+
+    if verbose:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"chromedriver resolved via {source} in {elapsed_ms:.1f} ms: {resolved}")
+    return resolved
+
+
+def main() -> None:
+    """Resolve the driver once and report where it came from and how long it took."""
+    try:
+        resolve_chromedriver()
+    except DriverResolutionError as e:
+        print("Driver resolution failed:", e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
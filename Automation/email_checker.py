@@ -0,0 +1,299 @@
+"""
+Email normalisation and cached verdicts for bulk checks.
+
+The page checks emails with `^\\S+@\\S+\\.\\S+$` plus an exact lookup in
+DATA.disposableDomains, recomputed for every address. Large imports repeat the
+same few thousand domains millions of times, so here the per-domain work is
+memoised:
+
+  - canonical_domain(): lowercase, trailing-dot strip, IDNA (punycode) and
+    provider aliases (googlemail.com -> gmail.com), in a bounded LRU
+  - EmailChecker.domain_verdict(): syntax + disposable verdict per domain
+    (subdomains of disposable domains count too), in a bounded LRU with
+    hit/miss counters (cache_info())
+
+Local parts get provider-specific canonicalisation (Gmail ignores dots and
++tags, Outlook/iCloud/Proton/Fastmail ignore +tags, Yahoo ignores -tags).
+rate_limit_key() is deliberately coarser: it lowercases and strips +tags for
+every domain, so it is safe as a throttling key but not for de-duplication.
+
+check_many() processes an iterable lazily as a generator pipeline, so files of
+any size stream through in constant memory.
+
+Usage:
+    python email_checker.py addresses.txt            # summary of verdicts
+    python email_checker.py addresses.txt --show-invalid
+    python email_checker.py --bench --count 500000   # cache on vs off
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from data_loader import load_data
+
+try:  # IDNA 2008 / UTS #46 when available; the stdlib codec implements IDNA 2003
+    import idna as _idna
+except ImportError:  # pragma: no cover - optional dependency
+    _idna = None
+
+DOMAIN_CACHE_SIZE = 8192
+
+DOMAIN_ALIASES = {
+    "googlemail.com": "gmail.com",
+}
+# domain -> (ignore dots in local part, tag separator or None)
+PROVIDER_RULES = {
+    "gmail.com": (True, "+"),
+    "outlook.com": (False, "+"),
+    "hotmail.com": (False, "+"),
+    "live.com": (False, "+"),
+    "icloud.com": (False, "+"),
+    "me.com": (False, "+"),
+    "protonmail.com": (False, "+"),
+    "proton.me": (False, "+"),
+    "fastmail.com": (False, "+"),
+    "yahoo.com": (False, "-"),
+}
+
+_LABEL_RE = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)$")
+_TLD_RE = re.compile(r"^(?:[a-z]{2,63}|xn--[a-z0-9-]{1,59})$")
+
+
+class DomainVerdict(NamedTuple):
+    """Cached outcome for one domain."""
+
+    domain: str
+    syntax_ok: bool
+    disposable: bool
+
+
+class EmailVerdict(NamedTuple):
+    """Outcome for one address; reason is '' when valid."""
+
+    address: str
+    normalised: str
+    valid: bool
+    reason: str
+
+
+def split_address(address: str) -> Optional[Tuple[str, str]]:
+    """Split into (local, domain) at the last '@'; None if either side is empty."""
+    local, sep, domain = address.strip().rpartition("@")
+    if not sep or not local or not domain:
+        return None
+    return local, domain
+
+
+def _to_ascii(domain: str) -> str:
+    """IDNA-encode a lowercase domain; raises UnicodeError when not encodable."""
+    if domain.isascii():
+        return domain
+    if _idna is not None:
+        try:
+            return _idna.encode(domain, uts46=True).decode("ascii")
+        except _idna.IDNAError as e:
+            raise UnicodeError(str(e)) from e
+    return domain.encode("idna").decode("ascii")
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def canonical_domain(domain: str) -> Optional[str]:
+    """Lowercase ASCII (punycode) form of domain with provider aliases applied.
+
+    Returns None when the domain cannot be IDNA-encoded.
+    """
+    domain = domain.strip().lower().rstrip(".")
+    try:
+        domain = _to_ascii(domain)
+    except UnicodeError:
+        return None
+    return DOMAIN_ALIASES.get(domain, domain)
+
+
+def canonical_local(local: str, domain: str) -> str:
+    """Apply the provider's local-part rules (domain must already be canonical)."""
+    rule = PROVIDER_RULES.get(domain)
+    if rule is None:
+        return local
+    drop_dots, tag = rule
+    local = local.lower()
+    if tag:
+        local = local.split(tag, 1)[0]
+    if drop_dots:
+        local = local.replace(".", "")
+    return local
+
+
+def normalise_address(address: str) -> str:
+    """Canonical form of an address for de-duplication.
+
+    Unparseable input is returned stripped and lowercased.
+    """
+    parts = split_address(address)
+    if parts is None:
+        return address.strip().lower()
+    local, domain = parts
+    ascii_domain = canonical_domain(domain)
+    if ascii_domain is None:
+        return address.strip().lower()
+    return f"{canonical_local(local, ascii_domain)}@{ascii_domain}"
+
+
+def rate_limit_key(address: str) -> str:
+    """Key for per-address rate limiting.
+
+    Coarser than normalise_address(): the local part is lowercased and cut at
+    the first '+' for every domain, so case or tag variants of one mailbox
+    share a bucket even on providers without PROVIDER_RULES.
+    """
+    parts = split_address(address)
+    if parts is None:
+        return address.strip().lower()
+    local, domain = parts
+    ascii_domain = canonical_domain(domain) or domain.strip().lower()
+    local = canonical_local(local, ascii_domain).lower().split("+", 1)[0]
+    return f"{local}@{ascii_domain}"
+
+
+def domain_syntax_ok(domain: str) -> bool:
+    """RFC 1035-style hostname check on an ASCII domain with at least one dot."""
+    if len(domain) > 253 or "." not in domain:
+        return False
+    labels = domain.split(".")
+    return all(_LABEL_RE.match(label) for label in labels) and bool(_TLD_RE.match(labels[-1]))
+
+
+class EmailChecker:
+    """Checks addresses against syntax and disposable-domain rules with per-domain memoisation."""
+
+    def __init__(self, disposable_domains: Iterable[str] = (), cache_size: int = 4096):
+        self.disposable = frozenset(d.strip().lower() for d in disposable_domains)
+        self.domain_verdict = lru_cache(maxsize=cache_size)(self._domain_verdict)
+
+    @classmethod
+    def from_data(cls, cache_size: int = 4096) -> "EmailChecker":
+        """Checker using DATA.disposableDomains from data.js."""
+        return cls(load_data().get("disposableDomains", []), cache_size)
+
+    def _is_disposable(self, domain: str) -> bool:
+        """True if domain or any parent domain is in the disposable list."""
+        labels = domain.split(".")
+        return any(".".join(labels[i:]) in self.disposable for i in range(len(labels) - 1))
+
+    def _domain_verdict(self, domain: str) -> DomainVerdict:
+        """Uncached verdict for a raw domain string."""
+        # the verdict cache already covers this, so skip the module-level one
+        ascii_domain = canonical_domain.__wrapped__(domain)
+        if ascii_domain is None or not domain_syntax_ok(ascii_domain):
+            return DomainVerdict(ascii_domain or domain.lower(), False, False)
+        return DomainVerdict(ascii_domain, True, self._is_disposable(ascii_domain))
+
+    def cache_info(self):
+        """hits/misses/maxsize/currsize of the domain verdict cache."""
+        return self.domain_verdict.cache_info()
+
+    def clear_cache(self) -> None:
+        """Drop memoised domain verdicts."""
+        self.domain_verdict.cache_clear()
+
+    def _verdict(self, address: str, parts: Optional[Tuple[str, str]]) -> EmailVerdict:
+        """Combine the split address with its (cached) domain verdict."""
+        if parts is None:
+            return EmailVerdict(address, address.lower(), False, "syntax")
+        local, domain = parts
+        if len(local) > 64 or any(ch.isspace() for ch in local):
+            return EmailVerdict(address, address.lower(), False, "syntax")
+        verdict = self.domain_verdict(domain)
+        normalised = f"{canonical_local(local, verdict.domain)}@{verdict.domain}"
+        if not verdict.syntax_ok:
+            return EmailVerdict(address, normalised, False, "domain")
+        if verdict.disposable:
+            return EmailVerdict(address, normalised, False, "disposable")
+        return EmailVerdict(address, normalised, True, "")
+
+    def check(self, address: str) -> EmailVerdict:
+        """Verdict for one address."""
+        address = address.strip()
+        return self._verdict(address, split_address(address))
+
+    def check_many(self, addresses: Iterable[str]) -> Iterator[EmailVerdict]:
+        """Lazily check a stream of addresses (blank lines are skipped)."""
+        stripped = (a.strip() for a in addresses)
+        present = (a for a in stripped if a)
+        split = ((a, split_address(a)) for a in present)
+        return (self._verdict(a, parts) for a, parts in split)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def synthetic_addresses(count: int, domains: int = 3000, seed: int = 7) -> Iterator[str]:
+    """Addresses whose domains follow a Zipf-like distribution (a few providers dominate)."""
+    rng = random.Random(seed)
+    popular = ["gmail.com", "outlook.com", "yahoo.com", "hotmail.com", "icloud.com", "googlemail.com"]
+    tail = [f"company{i}.co.in" if i % 3 else f"mail{i}.example.org" for i in range(domains - len(popular))]
+    pool = popular + tail + ["mailinator.com", "bücher.de", "bad_domain", "xn--bcher-kva.de"]
+    weights = [1.0 / (rank + 1) for rank in range(len(pool))]
+    for n, domain in enumerate(rng.choices(pool, weights=weights, k=count)):
+        yield f"User.{n}+news@{domain}"
+
+
+def run_benchmark(count: int, domains: int) -> None:
+    """Compare uncached vs cached checking over the same synthetic stream."""
+    disposable = load_data().get("disposableDomains", [])
+    addresses = list(synthetic_addresses(count, domains))
+    print(f"{count} addresses over {len({a.rpartition('@')[2] for a in addresses})} distinct domains")
+
+    for label, size in (("no cache", 0), ("LRU 4096", 4096)):
+        checker = EmailChecker(disposable, cache_size=size)
+        start = time.perf_counter()
+        reasons = Counter(v.reason or "ok" for v in checker.check_many(addresses))
+        elapsed = time.perf_counter() - start
+        print(f"{label:9s}: {elapsed:.3f}s  {count / elapsed:,.0f} addr/s  {dict(reasons)}")
+        if size:
+            info = checker.cache_info()
+            ratio = info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0
+            print(f"           cache hits={info.hits} misses={info.misses} hit ratio={ratio:.1%}")
+
+
+def main() -> None:
+    """Check a file of addresses or run the cache benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", help="file with one address per line ('-' for stdin)")
+    parser.add_argument("--show-invalid", action="store_true", help="print every rejected address")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--bench", action="store_true", help="benchmark cache effect on synthetic data")
+    parser.add_argument("--count", type=int, default=200_000, help="addresses for --bench")
+    parser.add_argument("--domains", type=int, default=3000, help="distinct domains for --bench")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(args.count, args.domains)
+        return
+    if not args.path:
+        parser.error("a path is required unless --bench is given")
+
+    checker = EmailChecker.from_data(args.cache_size)
+    reasons: Counter = Counter()
+    fh = sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8")
+    try:
+        for verdict in checker.check_many(fh):
+            reasons[verdict.reason or "ok"] += 1
+            if args.show_invalid and not verdict.valid:
+                print(f"{verdict.reason}\t{verdict.address}")
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+    print("Verdicts:", dict(reasons))
+    print("Domain cache:", checker.cache_info())
+
+
+if __name__ == "__main__":
+    main()
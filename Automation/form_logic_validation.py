@@ -30,7 +30,8 @@ from selenium.common.exceptions import (
     StaleElementReferenceException,
 )
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+
+from driver_resolver import resolve_chromedriver
 
 OUT = os.path.join(os.path.dirname(__file__), "automation_output")
 os.makedirs(OUT, exist_ok=True)
@@ -123,22 +124,14 @@ def find_confirm_error(driver) -> str:
     return ""
 
 
-def main() -> None:
-    """Run Automation Flow C:
-    - Validate Country → State update
-    - Validate State → City update
-    - Validate password strength
-    - Validate wrong Confirm Password error
-    - Validate submit button enabling logic
-    """
-    opts = Options()
-    opts.add_argument("--window-size=1200,900")
-    # opts.add_argument("--headless=new")  # keep visible during debugging
+COUNTRY_SEL = "#country"
+STATE_SEL = "#state"
+CITY_SEL = "#city"
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=opts)
 
-    summary = {
+def new_summary() -> dict:
+    """Return the Flow C result flags, all initially False."""
+    return {
         "states_updated": False,
         "cities_updated": False,
         "pwd_meter_changed": False,
@@ -146,198 +139,255 @@ def main() -> None:
         "submit_disabled_until_valid": False,
     }
 
+
+def step_country_state(driver, summary: dict) -> None:
+    """Step 1: change country -> expect states update."""
+    init_states = option_values(driver, STATE_SEL)
+    print("Initial states count:", len(init_states))
+
     try:
-        index_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "index.html"))
-        driver.get("file://" + index_path)
+        if driver.find_elements(By.CSS_SELECTOR, f"{COUNTRY_SEL} option[value='IN']"):
+            driver.find_element(By.CSS_SELECTOR, f"{COUNTRY_SEL} option[value='IN']").click()
+        else:
+            opts_list = driver.find_elements(By.CSS_SELECTOR, COUNTRY_SEL + " option")
+            if len(opts_list) > 1:
+                opts_list[1].click()
+    except (
+        NoSuchElementException,
+        WebDriverException,
+        ElementNotInteractableException,
+        StaleElementReferenceException,
+    ):
+        pass
+    time.sleep(0.35)
+
+    states_changed = wait_for_options_change(driver, STATE_SEL, init_states, timeout=5)
+    current_states = option_values(driver, STATE_SEL)
+    summary["states_updated"] = bool(states_changed and current_states != init_states)
+    print("States updated:", summary["states_updated"], " -> sample:", current_states[:6])
+    save_screenshot(driver, "step1_country_state")
+
+
+def step_state_city(driver, summary: dict) -> None:
+    """Step 2: change state -> expect cities update (needs a country selected)."""
+    init_cities = option_values(driver, CITY_SEL)
+    print("Initial cities count:", len(init_cities))
+    current_states = option_values(driver, STATE_SEL)
+
+    # choose Telangana if present else second option
+    chosen_state = None
+    for v in current_states:
+        if v and "Telangana" in str(v):
+            chosen_state = v
+            break
+    if not chosen_state:
+        opts_list = driver.find_elements(By.CSS_SELECTOR, STATE_SEL + " option")
+        if len(opts_list) > 1:
+            chosen_state = opts_list[1].get_attribute("value") or opts_list[1].text
+
+    try:
+        if chosen_state:
+            state_option = f"{STATE_SEL} option[value='{chosen_state}']"
+            driver.find_element(By.CSS_SELECTOR, state_option).click()
+
+        else:
+            opts_list = driver.find_elements(By.CSS_SELECTOR, STATE_SEL + " option")
+            if len(opts_list) > 1:
+                opts_list[1].click()
+    except (
+        NoSuchElementException,
+        WebDriverException,
+        ElementNotInteractableException,
+        StaleElementReferenceException,
+    ):
+        pass
+    time.sleep(0.25)
+
+    cities_changed = wait_for_options_change(driver, CITY_SEL, init_cities, timeout=5)
+    current_cities = option_values(driver, CITY_SEL)
+    summary["cities_updated"] = bool(cities_changed and current_cities != init_cities)
+    print("Cities updated:", summary["cities_updated"], " -> sample:", current_cities[:6])
+    save_screenshot(driver, "step2_state_city")
+
+
+def step_password_strength(driver, summary: dict) -> None:
+    """Step 3: password strength meter changes from weak to strong."""
+    try:
+        pw_el = driver.find_element(By.ID, "password")
+    except NoSuchElementException:
+        pw_el = None
+
+    weak_text = ""
+    strong_text = ""
+    if pw_el:
+        pw_el.clear()
+        pw_el.send_keys("12345")
+        time.sleep(0.45)
+        weak_text = find_pwd_strength_text(driver)
+        print("Weak indicator:", weak_text)
+        save_screenshot(driver, "step3_pwd_weak")
+
+        pw_el.clear()
+        pw_el.send_keys("Str0ngP@ssw0rd!")
         time.sleep(0.6)
-        print("URL:", driver.current_url)
-        print("Title:", driver.title)
+        strong_text = find_pwd_strength_text(driver)
+        print("Strong indicator:", strong_text)
+        save_screenshot(driver, "step3_pwd_strong")
+
+        password_meter_changed = (
+            weak_text
+            and strong_text
+            and weak_text != strong_text
+        )
 
-        country_sel = "#country"
-        state_sel = "#state"
-        city_sel = "#city"
+        summary["pwd_meter_changed"] = bool(password_meter_changed)
 
-        # baseline values
-        init_states = option_values(driver, state_sel)
-        init_cities = option_values(driver, city_sel)
-        print("Initial states count:", len(init_states))
-        print("Initial cities count:", len(init_cities))
 
-        try:
-            if driver.find_elements(By.CSS_SELECTOR, f"{country_sel} option[value='IN']"):
-                driver.find_element(By.CSS_SELECTOR, f"{country_sel} option[value='IN']").click()
-            else:
-                opts_list = driver.find_elements(By.CSS_SELECTOR, country_sel + " option")
-                if len(opts_list) > 1:
-                    opts_list[1].click()
-        except (
-            NoSuchElementException,
-            WebDriverException,
-            ElementNotInteractableException,
-            StaleElementReferenceException,
-        ):
-            pass
-        time.sleep(0.35)
-
-        states_changed = wait_for_options_change(driver, state_sel, init_states, timeout=5)
-        current_states = option_values(driver, state_sel)
-        summary["states_updated"] = bool(states_changed and current_states != init_states)
-        print("States updated:", summary["states_updated"], " -> sample:", current_states[:6])
-        save_screenshot(driver, "step1_country_state")
-
-        # Step 2: change state -> expect cities update
-        # choose Telangana if present else second option
-        chosen_state = None
-        for v in current_states:
-            if v and "Telangana" in str(v):
-                chosen_state = v
-                break
-        if not chosen_state:
-            opts_list = driver.find_elements(By.CSS_SELECTOR, state_sel + " option")
-            if len(opts_list) > 1:
-                chosen_state = opts_list[1].get_attribute("value") or opts_list[1].text
+def step_confirm_error(driver, summary: dict) -> None:
+    """Step 4: wrong confirm password -> error should appear."""
+    try:
+        cpw_el = driver.find_element(By.ID, "confirmPassword")
+        cpw_el.clear()
+        cpw_el.send_keys("WrongPassword")
+        # blur to trigger validation
+        driver.execute_script("arguments[0].blur();", cpw_el)
+        time.sleep(0.45)
+    except NoSuchElementException:
+        pass
+
+    confirm_err = find_confirm_error(driver)
+    summary["confirm_error_shown"] = bool(confirm_err)
+    print("Confirm password error text:", repr(confirm_err))
+    save_screenshot(driver, "step4_confirm_error")
+
+
+def step_submit_state(driver, summary: dict) -> None:
+    """Step 5: submit disabled until valid -> fill remaining fields but keep confirm wrong."""
+    try:
+        fn = driver.find_element(By.ID, "firstName")
+        ln = driver.find_element(By.ID, "lastName")
+        em = driver.find_element(By.ID, "email")
+        ph = driver.find_element(By.ID, "phone")
+        tcb = driver.find_element(By.ID, "terms")
+    except NoSuchElementException:
+        fn = ln = em = ph = tcb = None
 
-        try:
-            if chosen_state:
-                state_option = f"{state_sel} option[value='{chosen_state}']"
-                driver.find_element(By.CSS_SELECTOR, state_option).click()
-
-            else:
-                opts_list = driver.find_elements(By.CSS_SELECTOR, state_sel + " option")
-                if len(opts_list) > 1:
-                    opts_list[1].click()
-        except (
-            NoSuchElementException,
-            WebDriverException,
-            ElementNotInteractableException,
-            StaleElementReferenceException,
-        ):
-            pass
-        time.sleep(0.25)
-
-        cities_changed = wait_for_options_change(driver, city_sel, init_cities, timeout=5)
-        current_cities = option_values(driver, city_sel)
-        summary["cities_updated"] = bool(cities_changed and current_cities != init_cities)
-        print("Cities updated:", summary["cities_updated"], " -> sample:", current_cities[:6])
-        save_screenshot(driver, "step2_state_city")
-
-        # Step 3: password strength check
-        try:
-            pw_el = driver.find_element(By.ID, "password")
-        except NoSuchElementException:
-            pw_el = None
-
-        weak_text = ""
-        strong_text = ""
-        if pw_el:
-            pw_el.clear()
-            pw_el.send_keys("12345")
-            time.sleep(0.45)
-            weak_text = find_pwd_strength_text(driver)
-            print("Weak indicator:", weak_text)
-            save_screenshot(driver, "step3_pwd_weak")
-
-            pw_el.clear()
-            pw_el.send_keys("Str0ngP@ssw0rd!")
-            time.sleep(0.6)
-            strong_text = find_pwd_strength_text(driver)
-            print("Strong indicator:", strong_text)
-            save_screenshot(driver, "step3_pwd_strong")
-
-            password_meter_changed = (
-                weak_text
-                and strong_text
-                and weak_text != strong_text
-            )
-
-            summary["pwd_meter_changed"] = bool(password_meter_changed)
-
-
-        # Step 4: wrong confirm password -> error should appear
-        try:
-            cpw_el = driver.find_element(By.ID, "confirmPassword")
-            cpw_el.clear()
-            cpw_el.send_keys("WrongPassword")
-            # blur to trigger validation
-            driver.execute_script("arguments[0].blur();", cpw_el)
-            time.sleep(0.45)
-        except NoSuchElementException:
-            pass
-
-        confirm_err = find_confirm_error(driver)
-        summary["confirm_error_shown"] = bool(confirm_err)
-        print("Confirm password error text:", repr(confirm_err))
-        save_screenshot(driver, "step4_confirm_error")
-
-        # Step 5: submit disabled until valid -> fill remaining fields but keep confirm wrong
-        try:
-            fn = driver.find_element(By.ID, "firstName")
-            ln = driver.find_element(By.ID, "lastName")
-            em = driver.find_element(By.ID, "email")
-            ph = driver.find_element(By.ID, "phone")
-            tcb = driver.find_element(By.ID, "terms")
-        except NoSuchElementException:
-            fn = ln = em = ph = tcb = None
+    try:
+        if fn:
+            fn.clear()
+            fn.send_keys("Vishnu")
 
-        try:
-            if fn:
-                fn.clear()
-                fn.send_keys("Vishnu")
+        if ln:
+            ln.clear()
+            ln.send_keys("Thammadaveni")
 
-            if ln:
-                ln.clear()
-                ln.send_keys("Thammadaveni")
+        if em:
+            em.clear()
+            em.send_keys("vishnuthammadaveni@gmail.com")
 
-            if em:
-                em.clear()
-                em.send_keys("vishnuthammadaveni@gmail.com")
+        if ph:
+            ph.clear()
+            ph.send_keys("+919876543210")
 
-            if ph:
-                ph.clear()
-                ph.send_keys("+919876543210")
+        if tcb and not tcb.is_selected():
+            tcb.click()
 
-            if tcb and not tcb.is_selected():
-                tcb.click()
+    except (
+        NoSuchElementException,
+        WebDriverException,
+        ElementNotInteractableException,
+        StaleElementReferenceException
+    ):
+        # Ignore known Selenium-related errors when interacting with the fields.
+        pass
 
-        except (
-            NoSuchElementException,
-            WebDriverException,
-            ElementNotInteractableException,
-            StaleElementReferenceException
-        ):
-            # Ignore known Selenium-related errors when interacting with the fields.
-            pass
 
+    time.sleep(0.4)
+    try:
+        submit_btn = driver.find_element(By.ID, "submitBtn")
+    except NoSuchElementException:
+        submit_btn = None
 
-        time.sleep(0.4)
-        try:
-            submit_btn = driver.find_element(By.ID, "submitBtn")
-        except NoSuchElementException:
-            submit_btn = None
+    before_enabled = bool(submit_btn and submit_btn.is_enabled())
+    print("Submit enabled with wrong confirm?:", before_enabled)
 
-        before_enabled = bool(submit_btn and submit_btn.is_enabled())
-        print("Submit enabled with wrong confirm?:", before_enabled)
+    # fix confirm to match strong password
+    try:
+        cpw_el = driver.find_element(By.ID, "confirmPassword")
+        cpw_el.clear()
+        cpw_el.send_keys("Vishnu@#9908")
+        driver.execute_script("arguments[0].blur();", cpw_el)
+    except (
+        NoSuchElementException,
+        WebDriverException,
+        ElementNotInteractableException,
+        StaleElementReferenceException,
+    ):
+        # Ignore known Selenium-related errors when interacting with the confirm field.
+        pass
+
+    time.sleep(0.5)
+    after_enabled = bool(submit_btn and submit_btn.is_enabled())
+    print("Submit enabled after fixing confirm?:", after_enabled)
+    summary["submit_disabled_until_valid"] = (not before_enabled) and after_enabled
+    save_screenshot(driver, "step5_submit_state")
+
+
+# Steps in run order, and the earlier steps each one relies on for page state.
+STEPS = {
+    "country_state": step_country_state,
+    "state_city": step_state_city,
+    "password_strength": step_password_strength,
+    "confirm_error": step_confirm_error,
+    "submit_state": step_submit_state,
+}
+STEP_REQUIRES = {
+    "state_city": ("country_state",),
+    "submit_state": ("country_state", "state_city", "password_strength", "confirm_error"),
+}
+
+
+def resolve_steps(names) -> List[str]:
+    """Return names plus their prerequisites, in run order."""
+    wanted = set()
+    for name in names:
+        wanted.add(name)
+        wanted.update(STEP_REQUIRES.get(name, ()))
+    return [name for name in STEPS if name in wanted]
+
+
+def run_steps(driver, summary: dict, names=None) -> dict:
+    """Run the given steps (all by default) on an already-loaded page."""
+    for name in resolve_steps(names or STEPS):
+        STEPS[name](driver, summary)
+    return summary
 
-        # fix confirm to match strong password
-        try:
-            if cpw_el:
-                cpw_el.clear()
-                cpw_el.send_keys("Vishnu@#9908")
-                driver.execute_script("arguments[0].blur();", cpw_el)
-        except (
-            NoSuchElementException,
-            WebDriverException,
-            ElementNotInteractableException,
-            StaleElementReferenceException,
-        ):
-            # Ignore known Selenium-related errors when interacting with the confirm field.
-            pass
-
-        time.sleep(0.5)
-        after_enabled = bool(submit_btn and submit_btn.is_enabled())
-        print("Submit enabled after fixing confirm?:", after_enabled)
-        summary["submit_disabled_until_valid"] = (not before_enabled) and after_enabled
-        save_screenshot(driver, "step5_submit_state")
+
+def main() -> None:
+    """Run Automation Flow C:
+    - Validate Country → State update
+    - Validate State → City update
+    - Validate password strength
+    - Validate wrong Confirm Password error
+    - Validate submit button enabling logic
+    """
+    opts = Options()
+    opts.add_argument("--window-size=1200,900")
+    # opts.add_argument("--headless=new")  # keep visible during debugging
+
+    service = Service(resolve_chromedriver())
+    driver = webdriver.Chrome(service=service, options=opts)
+
+    summary = new_summary()
+
+    try:
+        index_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "index.html"))
+        driver.get("file://" + index_path)
+        time.sleep(0.6)
+        print("URL:", driver.current_url)
+        print("Title:", driver.title)
+
+        run_steps(driver, summary)
 
         # Summary printout
         print("\nFlow C summary:")
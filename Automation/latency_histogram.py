@@ -0,0 +1,111 @@
+"""
+HDR-style latency histogram.
+
+Values are recorded in microseconds into log-linear buckets: exact below 128 µs,
+then 64 buckets per power of two (~1.5 % relative error), so memory stays small
+and percentiles are cheap no matter how many samples are recorded.
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+PERCENTILES = (50.0, 95.0, 99.0, 99.9)
+
+
+def bucket_index(value: int) -> int:
+    """Bucket for a non-negative integer value."""
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+
+def bucket_upper(index: int) -> int:
+    """Highest value that lands in bucket index."""
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    mantissa = index - (shift << (SUB_BUCKET_BITS - 1))
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in microseconds.
+
+    Not thread-safe; give each thread its own histogram and merge() them.
+    """
+
+    def __init__(self):
+        self.counts: List[int] = []
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def record_us(self, value_us: int) -> None:
+        """Record one latency in microseconds."""
+        value_us = max(0, int(value_us))
+        idx = bucket_index(value_us)
+        if idx >= len(self.counts):
+            self.counts.extend([0] * (idx + 1 - len(self.counts)))
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def record(self, seconds: float) -> None:
+        """Record one latency in seconds."""
+        self.record_us(int(seconds * 1e6))
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add other's samples into this histogram; returns self.
+
+        other may still be recording in another thread: its counts are copied
+        first, so a concurrent record_us() that grows the list cannot
+        invalidate the loop (the merged totals may lag by that sample).
+        """
+        counts = list(other.counts)
+        if len(counts) > len(self.counts):
+            self.counts.extend([0] * (len(counts) - len(self.counts)))
+        for i, n in enumerate(counts):
+            self.counts[i] += n
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile(self, pct: float) -> int:
+        """Value (µs) at or below which pct percent of samples fall; 0 when empty."""
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(self.total * pct / 100.0))
+        running = 0
+        for i, n in enumerate(self.counts):
+            running += n
+            if running >= target:
+                return min(bucket_upper(i), self.max_us)
+        return self.max_us
+
+    def mean_us(self) -> float:
+        """Mean latency in microseconds."""
+        return self.sum_us / self.total if self.total else 0.0
+
+    def summary(self, percentiles: Iterable[float] = PERCENTILES) -> Dict[str, float]:
+        """Count, mean, max and the requested percentiles, all latencies in milliseconds."""
+        out: Dict[str, float] = {"count": self.total, "mean_ms": round(self.mean_us() / 1000, 3)}
+        for pct in percentiles:
+            key = "p" + (f"{pct:g}".replace(".", ""))
+            out[key + "_ms"] = round(self.percentile(pct) / 1000, 3)
+        out["max_ms"] = round(self.max_us / 1000, 3)
+        return out
+
+
+def merged(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    """Return a new histogram holding the samples of all histograms."""
+    result = LatencyHistogram()
+    for h in histograms:
+        result.merge(h)
+    return result
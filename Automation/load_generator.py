@@ -0,0 +1,381 @@
+"""
+Asyncio load generator and latency benchmark for registration submissions.
+
+Synthesises registration payloads from DATA in the shape built by the submit
+handler in script.js plus phone/phoneCode/password, a configurable share of
+them deliberately invalid (missing names, bad or disposable emails, unknown
+cities, weak passwords, bad phones), and replays them against a local HTTP
+endpoint such as registration_server.py.
+
+Modes:
+  --rate R           open loop: R requests/s on a fixed schedule; latency is
+                     measured from the scheduled send time, so a stalled
+                     server is not hidden by the generator slowing down
+  --concurrency C    closed loop: C workers each send as soon as the previous
+                     response arrives (default mode)
+  --ramp             closed loop with concurrency 1, 2, 4, ... --max-concurrency,
+                     reporting where throughput stops growing (saturation)
+
+Reports throughput, status codes and p50/p95/p99/p99.9 latency from an
+HDR-style histogram (latency_histogram.py).
+
+registration_server.py rate-limits per client IP and per email; to measure raw
+capacity start it with --trusted-proxies 1 and pass --clients N here so requests
+are spread over N simulated client IPs (X-Forwarded-For), or with
+--no-admission.
+
+Usage:
+    python load_generator.py --url http://127.0.0.1:8081/register --rate 200 --duration 10
+    python load_generator.py --concurrency 32 --invalid-ratio 0.2
+    python load_generator.py --ramp --max-concurrency 256 --step-duration 5
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from data_loader import load_data
+from latency_histogram import LatencyHistogram
+
+FIRST_NAMES = ("Vishnu", "Asha", "Ravi", "Priya", "John", "Emma", "Liam", "Olivia", "Noah", "Mia")
+LAST_NAMES = ("Thammadaveni", "Reddy", "Sharma", "Iyer", "Smith", "Brown", "Wilson", "Taylor")
+EMAIL_DOMAINS = ("gmail.com", "outlook.com", "yahoo.com", "example.com", "proton.me")
+PASSWORDS = ("Vishnu@#9908", "Str0ngP@ssw0rd!", "Hello#2024World", "Sup3r$ecret")
+
+RAMP_MIN_GAIN = 0.05  # a ramp step must add this much throughput to continue
+
+INVALID_KINDS = (
+    "missing_last_name",
+    "bad_email",
+    "disposable_email",
+    "unknown_city",
+    "weak_password",
+    "bad_phone",
+    "password_mismatch",
+)
+
+
+class PayloadFactory:
+    """Builds valid and invalid registration payloads from DATA."""
+
+    def __init__(self, data: dict, invalid_ratio: float = 0.0, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.invalid_ratio = invalid_ratio
+        self.disposable = data.get("disposableDomains") or ["mailinator.com"]
+        self.locations: List[Tuple[dict, str, str]] = [
+            (country, state["name"], city)
+            for country in data["countries"]
+            for state in country["states"]
+            for city in state["cities"]
+        ]
+        self._serial = itertools.count()
+
+    def valid(self) -> dict:
+        """A payload that passes every validation rule."""
+        rng = self.rng
+        country, state, city = rng.choice(self.locations)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        password = rng.choice(PASSWORDS)
+        n = next(self._serial)
+        return {
+            "firstName": first,
+            "lastName": last,
+            "email": f"{first.lower()}.{last.lower()}.{n}@{rng.choice(EMAIL_DOMAINS)}",
+            "country": country["code"],
+            "state": state,
+            "city": city,
+            "phoneCode": country["phoneCode"],
+            "phone": country["phoneCode"] + str(rng.randrange(6_000_000_000, 9_999_999_999)),
+            "password": password,
+            "confirmPassword": password,
+        }
+
+    def invalid(self, kind: Optional[str] = None) -> dict:
+        """A payload broken in one specific way (random kind by default)."""
+        payload = self.valid()
+        kind = kind or self.rng.choice(INVALID_KINDS)
+        if kind == "missing_last_name":
+            payload["lastName"] = ""
+        elif kind == "bad_email":
+            payload["email"] = payload["email"].replace("@", " at ")
+        elif kind == "disposable_email":
+            payload["email"] = payload["email"].split("@")[0] + "@" + self.rng.choice(self.disposable)
+        elif kind == "unknown_city":
+            payload["city"] = "Atlantis"
+        elif kind == "weak_password":
+            payload["password"] = payload["confirmPassword"] = "password"
+        elif kind == "bad_phone":
+            payload["phone"] = "12345"
+        elif kind == "password_mismatch":
+            payload["confirmPassword"] = payload["password"] + "x"
+        return payload
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Endless stream of encoded request bodies."""
+        while True:
+            if self.invalid_ratio and self.rng.random() < self.invalid_ratio:
+                payload = self.invalid()
+            else:
+                payload = self.valid()
+            yield json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client connection for JSON POSTs."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self) -> None:
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+
+    def close(self) -> None:
+        """Drop the connection; the next request reconnects."""
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def post(self, path: str, body: bytes, headers: Dict[str, str]) -> int:
+        """Send one POST and return the response status code."""
+        if self.writer is None:
+            await self._connect()
+        head = [f"POST {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                "Content-Type: application/json", f"Content-Length: {len(body)}"]
+        head.extend(f"{k}: {v}" for k, v in headers.items())
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            return await asyncio.wait_for(self._read_response(), self.timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _read_response(self) -> int:
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split(b" ", 2)[1])
+        length = 0
+        keep_alive = True
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value.strip())
+            elif name == "connection" and value.strip().lower() == "close":
+                keep_alive = False
+        if length:
+            await self.reader.readexactly(length)
+        if not keep_alive:
+            self.close()
+        return status
+
+
+class RunStats:
+    """Outcome of one load run."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.hist = LatencyHistogram()
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.elapsed = 0.0
+
+    @property
+    def completed(self) -> int:
+        """Number of responses received."""
+        return sum(self.statuses.values())
+
+    @property
+    def throughput(self) -> float:
+        """Responses per second over the run."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        """JSON-serialisable summary."""
+        return {
+            "label": self.label,
+            "elapsed_s": round(self.elapsed, 3),
+            "completed": self.completed,
+            "throughput_rps": round(self.throughput, 1),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "latency": self.hist.summary(),
+        }
+
+    def print(self) -> None:
+        """Human-readable report on stdout."""
+        lat = self.hist.summary()
+        print(f"{self.label}: {self.completed} responses in {self.elapsed:.2f}s "
+              f"-> {self.throughput:.1f} req/s")
+        print(f"  latency ms  p50={lat['p50_ms']}  p95={lat['p95_ms']}  p99={lat['p99_ms']}  "
+              f"p99.9={lat['p999_ms']}  max={lat['max_ms']}  mean={lat['mean_ms']}")
+        print(f"  statuses    {dict(sorted(self.statuses.items()))}")
+        if self.errors:
+            print(f"  errors      {dict(self.errors)}")
+
+
+class LoadGenerator:
+    """Shared target/payload configuration for open- and closed-loop runs."""
+
+    def __init__(self, url: str, factory: PayloadFactory, clients: int = 0, timeout: float = 10.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self.bodies = iter(factory)
+        self.client_ips = itertools.cycle(
+            [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}" for i in range(1, clients + 1)]
+        ) if clients else None
+
+    def _headers(self) -> Dict[str, str]:
+        return {"X-Forwarded-For": next(self.client_ips)} if self.client_ips else {}
+
+    async def _one(self, conn: HttpConnection, stats: RunStats, started: float) -> None:
+        try:
+            status = await conn.post(self.path, next(self.bodies), self._headers())
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            stats.errors[type(e).__name__] += 1
+            return
+        stats.statuses[status] += 1
+        stats.hist.record(time.perf_counter() - started)
+
+    async def closed_loop(self, concurrency: int, duration: float) -> RunStats:
+        """concurrency workers, each sending back-to-back for duration seconds."""
+        stats = RunStats(f"closed-loop c={concurrency}")
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            conn = HttpConnection(self.host, self.port, self.timeout)
+            while time.perf_counter() < deadline:
+                await self._one(conn, stats, time.perf_counter())
+            conn.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    async def open_loop(self, rate: float, duration: float, connections: int) -> RunStats:
+        """Fire rate requests/s on a fixed schedule using up to connections sockets."""
+        stats = RunStats(f"open-loop {rate:g} req/s")
+        pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(connections):
+            pool.put_nowait(HttpConnection(self.host, self.port, self.timeout))
+
+        async def fire(scheduled: float) -> None:
+            conn = await pool.get()
+            try:
+                # latency counts from the scheduled time: waiting for a free
+                # connection is part of what the user would experience
+                await self._one(conn, stats, scheduled)
+            finally:
+                pool.put_nowait(conn)
+
+        interval = 1.0 / rate
+        start = time.perf_counter()
+        tasks = []
+        for n in range(int(rate * duration)):
+            scheduled = start + n * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(fire(scheduled)))
+        await asyncio.gather(*tasks)
+        stats.elapsed = time.perf_counter() - start
+        while not pool.empty():
+            pool.get_nowait().close()
+        return stats
+
+    async def ramp(
+        self, max_concurrency: int, step_duration: float, min_gain: float = RAMP_MIN_GAIN
+    ) -> List[RunStats]:
+        """Double concurrency each step until throughput gains fall below min_gain."""
+        results: List[RunStats] = []
+        concurrency = 1
+        while concurrency <= max_concurrency:
+            stats = await self.closed_loop(concurrency, step_duration)
+            stats.print()
+            results.append(stats)
+            if len(results) >= 2 and not still_gaining(results[-2], stats, min_gain):
+                break
+            concurrency *= 2
+        return results
+
+
+def still_gaining(prev: RunStats, stats: RunStats, min_gain: float = RAMP_MIN_GAIN) -> bool:
+    """True if stats improved on prev's throughput by at least min_gain (ramp keeps going)."""
+    return not prev.throughput or stats.throughput >= prev.throughput * (1 + min_gain)
+
+
+def saturation_point(results: List[RunStats], min_gain: float = RAMP_MIN_GAIN) -> Optional[RunStats]:
+    """Best-throughput step of a ramp (the knee before latency-only growth).
+
+    None when the ramp ended at --max-concurrency with throughput still growing.
+    """
+    if len(results) < 2 or still_gaining(results[-2], results[-1], min_gain):
+        return None
+    return max(results, key=lambda s: s.throughput)
+
+
+def main() -> None:
+    """Parse arguments, run the selected mode and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8081/register")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--rate", type=float, help="open-loop requests per second")
+    parser.add_argument("--connections", type=int, default=64, help="socket pool size for --rate")
+    parser.add_argument("--concurrency", type=int, default=16, help="closed-loop workers")
+    parser.add_argument("--ramp", action="store_true", help="ramp concurrency to find saturation")
+    parser.add_argument("--max-concurrency", type=int, default=256)
+    parser.add_argument("--step-duration", type=float, default=5.0)
+    parser.add_argument("--invalid-ratio", type=float, default=0.0, help="share of invalid payloads (0..1)")
+    parser.add_argument("--clients", type=int, default=0, help="simulated client IPs via X-Forwarded-For")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    factory = PayloadFactory(load_data(), args.invalid_ratio, args.seed)
+    generator = LoadGenerator(args.url, factory, args.clients, args.timeout)
+
+    if args.ramp:
+        results = asyncio.run(generator.ramp(args.max_concurrency, args.step_duration))
+        best = saturation_point(results)
+        if best:
+            print(f"\nSaturation: ~{best.throughput:.1f} req/s at {best.label} "
+                  f"(p99 {best.hist.summary()['p99_ms']} ms)")
+        elif results:
+            last = results[-1]
+            print(f"\nNo saturation found: throughput still growing at {last.label} "
+                  f"(~{last.throughput:.1f} req/s); raise --max-concurrency")
+    elif args.rate:
+        results = [asyncio.run(generator.open_loop(args.rate, args.duration, args.connections))]
+        results[0].print()
+    else:
+        results = [asyncio.run(generator.closed_loop(args.concurrency, args.duration))]
+        results[0].print()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump([r.to_dict() for r in results], fh, indent=2)
+        print("Results written to:", args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,544 @@
+"""
+Fuzzy matching of free-text city/state input against DATA.
+
+The address textarea and imported legacy records contain misspelt or
+colloquial names ("Banglore", "Trichy") that don't match DATA exactly.
+Comparing each against every city with edit distance is O(cities) per
+lookup, so this module builds two indexes over every city and state name
+(plus a small table of well-known aliases):
+
+  - a character trigram inverted index: candidates are the names sharing the
+    most trigrams with the query (Dice coefficient), re-scored with
+    Levenshtein distance;
+  - a BK-tree keyed by Levenshtein distance: used for short queries, where
+    trigram overlap is unreliable, and as a fallback when the trigram
+    candidates are all poor.
+
+Levenshtein distance uses the bit-parallel (Myers/Hyyrö) algorithm, so each
+comparison costs one pass over the shorter string's bitmask.
+
+resolve() returns the best (city, state, country) candidates with a 0..1
+score; resolve_address() scans 1-3 word windows of a free-text address.
+normalise_file() batch-processes a file across a process pool.
+
+Usage:
+    python location_normaliser.py "Banglore" "Trichy" "12 MG Road, Mysuru, Karnataka"
+    python location_normaliser.py --file legacy.txt --out matches.tsv --workers 4
+    python location_normaliser.py --bench --cities 200000
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import random
+import re
+import time
+import unicodedata
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from data_loader import load_data
+
+# colloquial / former names -> name used in DATA
+ALIASES = {
+    "Bangalore": "Bengaluru",
+    "Trichy": "Tiruchirappalli",
+    "Tiruchi": "Tiruchirappalli",
+    "Bombay": "Mumbai",
+    "Madras": "Chennai",
+    "Calcutta": "Kolkata",
+    "Mysuru": "Mysore",
+    "Mangaluru": "Mangalore",
+    "Belgaum": "Belagavi",
+    "Hubballi": "Hubli",
+    "Shimoga": "Shivamogga",
+    "Tumakuru": "Tumkur",
+    "Bellary": "Ballari",
+    "Allahabad": "Prayagraj",
+    "Trivandrum": "Thiruvananthapuram",
+    "Cochin": "Kochi",
+    "Calicut": "Kozhikode",
+    "Baroda": "Vadodara",
+    "Poona": "Pune",
+    "Tuticorin": "Thoothukudi",
+    "NYC": "New York City",
+}
+
+MIN_SCORE = 0.6
+NGRAM = 3
+CANDIDATES = 50
+SHORT_QUERY = 5
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+class Candidate(NamedTuple):
+    """One resolution; city is None for a state-level match."""
+
+    city: Optional[str]
+    state: str
+    country: str
+    score: float
+    matched: str
+
+
+def normalise_key(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def ngrams(key: str, n: int = NGRAM) -> List[str]:
+    """Distinct character n-grams of key padded with spaces."""
+    padded = f" {key} "
+    return list({padded[i:i + n] for i in range(max(1, len(padded) - n + 1))})
+
+
+# ---------------------------------------------------------------------------
+# Levenshtein distance (bit-parallel)
+# ---------------------------------------------------------------------------
+
+def pattern_masks(pattern: str) -> Dict[str, int]:
+    """Per-character bitmask of positions in pattern (precompute once per query)."""
+    masks: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def distance_masked(masks: Dict[str, int], m: int, text: str) -> int:
+    """Levenshtein distance between the m-character pattern behind masks and text."""
+    if m == 0:
+        return len(text)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for ch in text:
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance between a and b."""
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    return distance_masked(pattern_masks(a), len(a), b)
+
+
+def similarity(distance: int, a: str, b: str) -> float:
+    """Map an edit distance to a 0..1 score relative to the longer string."""
+    longest = max(len(a), len(b)) or 1
+    return max(0.0, 1.0 - distance / longest)
+
+
+# ---------------------------------------------------------------------------
+# BK-tree
+# ---------------------------------------------------------------------------
+
+class BKTree:
+    """Burkhard-Keller tree over strings with Levenshtein distance.
+
+    Nodes are [key, payload, {distance: child}] lists; insert and search are
+    iterative so deep trees don't hit the recursion limit.
+    """
+
+    def __init__(self):
+        self.root: Optional[list] = None
+        self.size = 0
+
+    def add(self, key: str, payload: int) -> None:
+        """Insert key (payload is returned by search)."""
+        self.size += 1
+        if self.root is None:
+            self.root = [key, payload, {}]
+            return
+        masks, m = pattern_masks(key), len(key)
+        node = self.root
+        while True:
+            d = distance_masked(masks, m, node[0])
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [key, payload, {}]
+                return
+            node = child
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, str, int]]:
+        """All (distance, key, payload) within max_distance of query."""
+        if self.root is None:
+            return []
+        masks, m = pattern_masks(query), len(query)
+        found = []
+        stack = [self.root]
+        while stack:
+            key, payload, children = stack.pop()
+            d = distance_masked(masks, m, key)
+            if d <= max_distance:
+                found.append((d, key, payload))
+            lo, hi = d - max_distance, d + max_distance
+            stack.extend(child for dist, child in children.items() if lo <= dist <= hi)
+        return found
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class LocationNormaliser:
+    """Trigram index + BK-tree over every city and state name in DATA."""
+
+    def __init__(self, data: dict, aliases: Optional[Dict[str, str]] = None):
+        # entry: (city or None, state, country code)
+        self.entries: List[Tuple[Optional[str], str, str]] = []
+        self.keys: List[str] = []
+        self.key_ids: Dict[str, int] = {}
+        self.key_entries: List[List[int]] = []
+        self.postings: Dict[str, List[int]] = {}
+        self._bktree: Optional[BKTree] = None
+
+        by_name: Dict[str, List[int]] = {}
+        for country in data["countries"]:
+            for state in country["states"]:
+                sid = len(self.entries)
+                self.entries.append((None, state["name"], country["code"]))
+                self._add_key(state["name"], sid)
+                for city in state["cities"]:
+                    eid = len(self.entries)
+                    self.entries.append((city, state["name"], country["code"]))
+                    self._add_key(city, eid)
+                    by_name.setdefault(city, []).append(eid)
+        for alias, target in (ALIASES if aliases is None else aliases).items():
+            for eid in by_name.get(target, []):
+                self._add_key(alias, eid)
+
+        self._common = max(50, len(self.keys) // 20)
+
+    def _add_key(self, name: str, entry_id: int) -> None:
+        """Register name as a lookup key for entry_id."""
+        key = normalise_key(name)
+        if not key:
+            return
+        kid = self.key_ids.get(key)
+        if kid is None:
+            kid = self.key_ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.key_entries.append([])
+            for gram in ngrams(key):
+                self.postings.setdefault(gram, []).append(kid)
+        if entry_id not in self.key_entries[kid]:
+            self.key_entries[kid].append(entry_id)
+
+    @property
+    def bktree(self) -> BKTree:
+        """BK-tree over all keys, built on first use."""
+        if self._bktree is None:
+            tree = BKTree()
+            order = list(range(len(self.keys)))
+            # random insertion order keeps the tree balanced-ish
+            random.Random(0).shuffle(order)
+            for kid in order:
+                tree.add(self.keys[kid], kid)
+            self._bktree = tree
+        return self._bktree
+
+    def _ngram_candidates(self, key: str, limit: int) -> List[int]:
+        """Key ids sharing the most trigrams with key (rare grams preferred)."""
+        grams = ngrams(key)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        selective = [p for p in lists if len(p) <= self._common]
+        # very common grams add little but cost a lot; keep them only if nothing else matched
+        counts = Counter(itertools.chain.from_iterable(selective or lists))
+        n = len(grams)
+        shortlist = counts.most_common(limit * 4)
+        scored = [(2.0 * c / (n + len(self.keys[kid]) + 1), kid) for kid, c in shortlist]
+        return [kid for _, kid in heapq.nlargest(limit, scored)]
+
+    def _score_keys(self, key: str, kids: Iterable[int]) -> Dict[int, float]:
+        """Levenshtein similarity of key against each candidate key id."""
+        masks, m = pattern_masks(key), len(key)
+        return {kid: similarity(distance_masked(masks, m, self.keys[kid]), key, self.keys[kid]) for kid in kids}
+
+    def resolve(self, text: str, limit: int = 3, min_score: float = MIN_SCORE) -> List[Candidate]:
+        """Best (city, state, country) candidates for a single place name."""
+        key = normalise_key(text)
+        if not key:
+            return []
+        kid = self.key_ids.get(key)
+        if kid is not None:
+            scores = {kid: 1.0}
+        else:
+            scores = self._score_keys(key, self._ngram_candidates(key, CANDIDATES))
+            best = max(scores.values(), default=0.0)
+            if len(key) <= SHORT_QUERY or best < min_score:
+                tolerance = max(1, len(key) // 4)
+                for d, found, fkid in self.bktree.search(key, tolerance):
+                    scores[fkid] = max(scores.get(fkid, 0.0), similarity(d, key, found))
+
+        results: Dict[int, Candidate] = {}
+        for kid, score in scores.items():
+            if score < min_score:
+                continue
+            for eid in self.key_entries[kid]:
+                if eid not in results or results[eid].score < score:
+                    city, state, country = self.entries[eid]
+                    results[eid] = Candidate(city, state, country, round(score, 3), self.keys[kid])
+        # prefer cities over states on ties: a city pins down the state as well
+        ranked = sorted(results.values(), key=lambda c: (-c.score, c.city is None, c.country, c.state))
+        return ranked[:limit]
+
+    def resolve_address(self, text: str, limit: int = 3, min_score: float = MIN_SCORE) -> List[Candidate]:
+        """Best candidates for a free-text address, scanning 1-3 word windows.
+
+        A city candidate whose state is also mentioned gets a small boost and
+        replaces the bare state match it confirms.
+        """
+        words = normalise_key(text).split()
+        found: Dict[Tuple[Optional[str], str, str], Candidate] = {}
+        for size in (3, 2, 1):
+            for i in range(len(words) - size + 1):
+                window = " ".join(words[i:i + size])
+                if size == 1 and (len(window) < 3 or window.isdigit()):
+                    continue
+                for cand in self.resolve(window, limit=5, min_score=min_score):
+                    ident = (cand.city, cand.state, cand.country)
+                    if ident not in found or found[ident].score < cand.score:
+                        found[ident] = cand
+        states = {(c.state, c.country) for c in found.values() if c.city is None}
+        confirmed = {(c.state, c.country) for c in found.values() if c.city is not None} & states
+        ranked = []
+        for cand in found.values():
+            place = (cand.state, cand.country)
+            if cand.city is None:
+                if place not in confirmed:
+                    ranked.append(cand)
+            elif place in confirmed:
+                ranked.append(cand._replace(score=round(min(1.0, cand.score + 0.1), 3)))
+            else:
+                ranked.append(cand)
+        ranked.sort(key=lambda c: (-c.score, c.city is None, c.country, c.state))
+        return ranked[:limit]
+
+
+# ---------------------------------------------------------------------------
+# Batch processing
+# ---------------------------------------------------------------------------
+
+_worker: Optional[LocationNormaliser] = None
+
+
+def _init_worker(data: Optional[dict]) -> None:
+    """Process-pool initializer: build the index once per worker."""
+    global _worker
+    _worker = LocationNormaliser(data if data is not None else load_data())
+
+
+def _resolve_chunk(lines: List[str]) -> List[str]:
+    """Resolve a chunk of input lines into TSV rows."""
+    rows = []
+    for line in lines:
+        # tabs in the input would shift the TSV columns
+        text = line.replace("\t", " ").strip()
+        best = _worker.resolve_address(text, limit=1) if text else []
+        if best:
+            c = best[0]
+            rows.append(f"{text}\t{c.city or ''}\t{c.state}\t{c.country}\t{c.score}")
+        else:
+            rows.append(f"{text}\t\t\t\t0")
+    return rows
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split a line stream into lists of at most size lines."""
+    it = iter(lines)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def normalise_lines(
+    lines: Iterable[str], workers: int = 0, data: Optional[dict] = None, chunk_size: int = 2000
+) -> Iterator[str]:
+    """Yield a TSV row (input, city, state, country, score) per input line, in order.
+
+    Tabs in the input are replaced with spaces in the first column.
+
+    workers=0 uses one process per CPU; workers=1 stays in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(data)
+        for chunk in _chunks(lines, chunk_size):
+            yield from _resolve_chunk(chunk)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(data,)) as pool:
+        # Executor.map() would submit every chunk up front; keep a bounded window
+        # in flight so memory stays flat however large the input is
+        pending: Deque[Future] = deque()
+        for chunk in _chunks(lines, chunk_size):
+            pending.append(pool.submit(_resolve_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def normalise_file(in_path: str, out_path: str, workers: int = 0) -> int:
+    """Resolve every line of in_path into out_path (TSV); returns the line count."""
+    count = 0
+    with open(in_path, "r", encoding="utf-8") as src, open(out_path, "w", encoding="utf-8") as dst:
+        dst.write("input\tcity\tstate\tcountry\tscore\n")
+        for row in normalise_lines(src, workers):
+            dst.write(row + "\n")
+            count += 1
+    return count
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+_SYLLABLES = (
+    "ka", "ra", "pur", "na", "ga", "bad", "li", "ko", "ta", "ma", "ji", "van", "dur", "ha", "sa", "wal",
+    "ne", "ri", "to", "chi", "lam", "de", "vi", "sha", "gar", "tir", "uru", "pa", "bro", "ston", "ville",
+    "ford", "ham", "ber", "mon", "kel", "zen", "qu", "yar", "ox", "dha", "pet", "nag", "kot", "gul",
+    "bha", "mir", "sel", "thu", "jo", "fen", "wick", "lo", "bu", "kri", "ush", "ela", "mba", "tra", "sk",
+)
+
+
+def synthetic_data(cities: int, per_state: int = 100, seed: int = 1) -> dict:
+    """DATA-shaped dict with roughly `cities` unique generated city names."""
+    rng = random.Random(seed)
+    seen = set()
+    names = []
+    while len(names) < cities:
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 5))).capitalize()
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    states = [names[i:i + per_state] for i in range(0, len(names), per_state)]
+    countries = []
+    for c in range(0, len(states), 50):
+        countries.append({
+            "code": f"C{c // 50:02d}",
+            "name": f"Country {c // 50}",
+            "phoneCode": f"+{800 + c // 50}",
+            "states": [{"name": f"State {c + i}", "cities": s} for i, s in enumerate(states[c:c + 50])],
+        })
+    return {"countries": countries, "disposableDomains": []}
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Apply one random edit (drop, swap, replace or insert a letter)."""
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 1)
+    op = rng.randrange(4)
+    letter = rng.choice("aeiourstnlk")
+    if op == 0:
+        return name[:i] + name[i + 1:]
+    if op == 1:
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    if op == 2:
+        return name[:i] + letter + name[i + 1:]
+    return name[:i] + letter + name[i:]
+
+
+def run_benchmark(cities: int, queries: int, workers: int) -> None:
+    """Build the index over synthetic cities and time lookups against a linear scan."""
+    rng = random.Random(2)
+    data = synthetic_data(cities)
+    all_cities = [(city, st["name"]) for c in data["countries"] for st in c["states"] for city in st["cities"]]
+    print(f"{len(all_cities)} cities in {sum(len(c['states']) for c in data['countries'])} states")
+
+    start = time.perf_counter()
+    normaliser = LocationNormaliser(data, aliases={})
+    print(f"trigram index: {time.perf_counter() - start:.2f}s "
+          f"({len(normaliser.keys)} keys, {len(normaliser.postings)} grams)")
+    start = time.perf_counter()
+    tree = normaliser.bktree
+    print(f"BK-tree:       {time.perf_counter() - start:.2f}s ({tree.size} nodes)")
+
+    sample = rng.sample(all_cities, queries)
+    typos = [(misspell(city, rng), city) for city, _ in sample]
+
+    start = time.perf_counter()
+    hits = 0
+    for typo, city in typos:
+        best = normaliser.resolve(typo, limit=1)
+        hits += bool(best) and best[0].city == city
+    indexed = (time.perf_counter() - start) / len(typos)
+    print(f"indexed lookup: {indexed * 1000:.2f} ms/query, top-1 accuracy {hits / len(typos):.1%}")
+
+    keys = normaliser.keys
+    naive_n = min(20, len(typos))
+    start = time.perf_counter()
+    for typo, _ in typos[:naive_n]:
+        q = normalise_key(typo)
+        min(keys, key=lambda k: levenshtein(q, k))
+    naive = (time.perf_counter() - start) / naive_n
+    print(f"linear scan:    {naive * 1000:.2f} ms/query ({naive / indexed:.0f}x slower)")
+
+    if workers != 1:
+        lines = [typo for typo, _ in typos] * max(1, 20_000 // len(typos))
+        start = time.perf_counter()
+        n = sum(1 for _ in normalise_lines(lines, workers, data))
+        elapsed = time.perf_counter() - start
+        print(f"process pool ({workers or os.cpu_count()} workers): {n} lines in {elapsed:.2f}s "
+              f"incl. per-worker index build")
+
+
+def main() -> None:
+    """Resolve names given on the command line, a file, or run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("text", nargs="*", help="place names or addresses to resolve")
+    parser.add_argument("--file", help="input file, one name/address per line")
+    parser.add_argument("--out", help="TSV output for --file (default: <file>.matches.tsv)")
+    parser.add_argument("--workers", type=int, default=0, help="processes for --file/--bench (0 = CPU count)")
+    parser.add_argument("--bench", action="store_true", help="benchmark against synthetic cities")
+    parser.add_argument("--cities", type=int, default=200_000, help="synthetic city count for --bench")
+    parser.add_argument("--queries", type=int, default=500, help="misspelt lookups for --bench")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(args.cities, args.queries, args.workers)
+        return
+    if args.file:
+        out = args.out or args.file + ".matches.tsv"
+        start = time.perf_counter()
+        n = normalise_file(args.file, out, args.workers)
+        print(f"Resolved {n} lines in {time.perf_counter() - start:.2f}s -> {out}")
+        return
+    if not args.text:
+        parser.error("give place names, --file or --bench")
+
+    normaliser = LocationNormaliser(load_data())
+    for text in args.text:
+        print(f"{text!r}:")
+        results = normaliser.resolve_address(text)
+        if not results:
+            print("  (no match)")
+        for c in results:
+            where = ", ".join(p for p in (c.city, c.state, c.country) if p)
+            print(f"  {c.score:.3f}  {where}  (matched {c.matched!r})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Location rollups and analytics over stored registrations.
+
+Consumes registration records shaped like the payload built by the submit
+handler in script.js:
+
+    {"firstName": ..., "lastName": ..., "email": ...,
+     "country": "IN", "state": "Telangana", "city": "Hyderabad",
+     "submittedAt": 1763251200}          # optional, epoch seconds or ISO-8601
+
+Every country/state/city in DATA gets a stable integer ID (depth-first order
+of data.js). Counters live in array-backed columns, one column per level,
+both as running totals and per time bucket (one day by default), so:
+
+  - point queries ("sign-ups in Telangana this week") are a handful of array
+    lookups,
+  - top-K is a single pass over one column,
+  - new records are added incrementally; a snapshot remembers how far into the
+    JSONL store it has read so the next run only consumes the tail,
+  - --rebuild streams the full history from scratch.
+
+Records without a usable submittedAt (script.js itself sends none) only count
+towards the totals and the "undated" counter, never towards a time bucket, so
+time-filtered answers are the same before and after a rebuild.
+
+Usage:
+    python registration_analytics.py [store.jsonl] --level state --top 5 --days 7
+    python registration_analytics.py --country IN --state Telangana --days 7
+    python registration_analytics.py --rebuild
+"""
+
+import argparse
+import heapq
+import json
+import os
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data_loader import load_data
+
+OUT = os.path.join(os.path.dirname(__file__), "automation_output")
+STORE_PATH = os.path.join(OUT, "registrations.jsonl")
+SNAPSHOT_PATH = os.path.join(OUT, "rollup_snapshot.json")
+
+LEVELS = ("country", "state", "city")
+DAY = 86400
+
+
+class LocationIndex:
+    """Stable integer IDs for every country, state and city in DATA."""
+
+    def __init__(self, data: dict):
+        self.country_ids: Dict[str, int] = {}
+        self.state_ids: Dict[Tuple[int, str], int] = {}
+        self.city_ids: Dict[Tuple[int, str], int] = {}
+        self.labels: Dict[str, List[str]] = {level: [] for level in LEVELS}
+        self.state_country = array("i")
+        self.city_state = array("i")
+
+        for country in data["countries"]:
+            cid = len(self.labels["country"])
+            self.country_ids[country["code"]] = cid
+            self.labels["country"].append(country["code"])
+            for state in country["states"]:
+                sid = len(self.labels["state"])
+                self.state_ids[(cid, state["name"])] = sid
+                self.labels["state"].append(f"{state['name']}, {country['code']}")
+                self.state_country.append(cid)
+                for city in state["cities"]:
+                    self.city_ids[(sid, city)] = len(self.labels["city"])
+                    self.labels["city"].append(f"{city}, {state['name']}, {country['code']}")
+                    self.city_state.append(sid)
+
+    def size(self, level: str) -> int:
+        """Number of IDs at level."""
+        return len(self.labels[level])
+
+    def resolve(
+        self, country: Optional[str], state: Optional[str] = None, city: Optional[str] = None
+    ) -> Tuple[int, int, int]:
+        """Map names to (country_id, state_id, city_id); -1 marks a missing/unknown part."""
+        cid = self.country_ids.get(country or "", -1)
+        sid = self.state_ids.get((cid, state or ""), -1) if cid >= 0 else -1
+        ci = self.city_ids.get((sid, city or ""), -1) if sid >= 0 else -1
+        return cid, sid, ci
+
+
+def _new_columns(index: LocationIndex) -> Dict[str, array]:
+    """One zeroed int64 counter column per level."""
+    return {level: array("q", bytes(8 * index.size(level))) for level in LEVELS}
+
+
+def record_time(record: dict) -> Optional[float]:
+    """Return the record's submittedAt as epoch seconds (None if absent/unparseable)."""
+    value = record.get("submittedAt")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+
+class LocationRollup:
+    """Incrementally updated per-location counters, in total and per time bucket."""
+
+    def __init__(self, index: LocationIndex, bucket_seconds: int = DAY):
+        self.index = index
+        self.bucket_seconds = bucket_seconds
+        self.totals = _new_columns(index)
+        self.buckets: Dict[int, Dict[str, array]] = {}
+        self.bucket_span: Optional[Tuple[int, int]] = None  # (first, last) bucket with data
+        self.records = 0
+        self.unknown = 0
+        self.undated = 0
+        self.source_offset = 0
+
+    def reset(self) -> None:
+        """Drop all counters."""
+        self.totals = _new_columns(self.index)
+        self.buckets = {}
+        self.bucket_span = None
+        self.records = 0
+        self.unknown = 0
+        self.undated = 0
+        self.source_offset = 0
+
+    def add(self, record: dict) -> bool:
+        """Count one registration record; returns False if its location is not in DATA.
+
+        Records without a usable submittedAt are counted in the totals only.
+        """
+        self.records += 1
+        cid, sid, ci = self.index.resolve(record.get("country"), record.get("state"), record.get("city"))
+        if ci < 0:
+            self.unknown += 1
+            return False
+        targets = [self.totals]
+        stamp = record_time(record)
+        if stamp is None:
+            self.undated += 1
+        else:
+            bucket = int(stamp // self.bucket_seconds)
+            columns = self.buckets.get(bucket)
+            if columns is None:
+                columns = self.buckets[bucket] = _new_columns(self.index)
+                first, last = self.bucket_span or (bucket, bucket)
+                self.bucket_span = (min(first, bucket), max(last, bucket))
+            targets.append(columns)
+        for cols in targets:
+            cols["country"][cid] += 1
+            cols["state"][sid] += 1
+            cols["city"][ci] += 1
+        return True
+
+    def add_many(self, records: Iterable[dict]) -> int:
+        """Count every record from an iterable; returns how many were counted."""
+        return sum(1 for record in records if self.add(record))
+
+    def rebuild(self, records: Iterable[dict]) -> int:
+        """Discard all counters and recount from a full-history stream."""
+        self.reset()
+        return self.add_many(records)
+
+    def _columns_in_range(self, since: Optional[float], until: Optional[float]) -> Iterator[Dict[str, array]]:
+        """Yield the bucket columns overlapping [since, until)."""
+        if self.bucket_span is None:
+            return
+        first, last = self.bucket_span
+        lo = first if since is None else max(first, int(since // self.bucket_seconds))
+        hi = last if until is None else min(last, int(until // self.bucket_seconds))
+        if hi - lo < len(self.buckets):
+            # bounded window: only touch the buckets inside it
+            for bucket in range(lo, hi + 1):
+                columns = self.buckets.get(bucket)
+                if columns is not None:
+                    yield columns
+        else:
+            # window wider than the history (e.g. since=0): scan what exists
+            for bucket, columns in self.buckets.items():
+                if lo <= bucket <= hi:
+                    yield columns
+
+    def count(
+        self,
+        country: Optional[str] = None,
+        state: Optional[str] = None,
+        city: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> int:
+        """Registrations for the most specific location given (all locations if none).
+
+        Time filtering is at bucket granularity and skips undated records.
+        """
+        if country is None:
+            if since is None and until is None:
+                return self.records - self.unknown
+            return sum(sum(cols["country"]) for cols in self._columns_in_range(since, until))
+
+        cid, sid, ci = self.index.resolve(country, state, city)
+        if city is not None:
+            level, key = "city", ci
+        elif state is not None:
+            level, key = "state", sid
+        else:
+            level, key = "country", cid
+        if key < 0:
+            return 0
+        if since is None and until is None:
+            return self.totals[level][key]
+        return sum(cols[level][key] for cols in self._columns_in_range(since, until))
+
+    def top(
+        self, level: str, k: int = 10, since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[Tuple[str, int]]:
+        """The k busiest locations at level as (label, count), busiest first."""
+        if since is None and until is None:
+            column = self.totals[level]
+        else:
+            column = array("q", bytes(8 * self.index.size(level)))
+            for cols in self._columns_in_range(since, until):
+                for i, n in enumerate(cols[level]):
+                    if n:
+                        column[i] += n
+        labels = self.index.labels[level]
+        best = heapq.nlargest(k, (i for i, n in enumerate(column) if n), key=column.__getitem__)
+        return [(labels[i], column[i]) for i in best]
+
+    def to_dict(self) -> dict:
+        """Serialisable snapshot of all counters."""
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "records": self.records,
+            "unknown": self.unknown,
+            "undated": self.undated,
+            "source_offset": self.source_offset,
+            "labels": self.index.labels,
+            "totals": {level: col.tolist() for level, col in self.totals.items()},
+            "buckets": {
+                str(b): {level: col.tolist() for level, col in cols.items()} for b, cols in self.buckets.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, index: LocationIndex, snapshot: dict) -> "LocationRollup":
+        """Restore a snapshot; raises ValueError if DATA changed since it was taken."""
+        if snapshot.get("labels") != index.labels:
+            raise ValueError("snapshot was built against a different DATA; rebuild required")
+        rollup = cls(index, snapshot["bucket_seconds"])
+        rollup.records = snapshot["records"]
+        rollup.unknown = snapshot["unknown"]
+        rollup.undated = snapshot["undated"]
+        rollup.source_offset = snapshot["source_offset"]
+        rollup.totals = {level: array("q", col) for level, col in snapshot["totals"].items()}
+        rollup.buckets = {
+            int(b): {level: array("q", col) for level, col in cols.items()}
+            for b, cols in snapshot["buckets"].items()
+        }
+        if rollup.buckets:
+            rollup.bucket_span = (min(rollup.buckets), max(rollup.buckets))
+        return rollup
+
+
+def iter_records(path: str, offset: int = 0) -> Iterator[Tuple[dict, int]]:
+    """Stream (record, end_offset) pairs from a JSONL store, starting at byte offset.
+
+    A trailing partial line (writer mid-append) is left for the next run.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record, offset
+
+
+def catch_up(rollup: LocationRollup, path: str) -> int:
+    """Consume records appended to path since the rollup's last offset."""
+    if not os.path.exists(path):
+        return 0
+    if os.path.getsize(path) < rollup.source_offset:
+        # store was truncated/rotated: the old offset is meaningless
+        rollup.reset()
+    counted = 0
+    for record, end in iter_records(path, rollup.source_offset):
+        counted += rollup.add(record)
+        rollup.source_offset = end
+    return counted
+
+
+def load_rollup(index: LocationIndex, snapshot_path: str) -> LocationRollup:
+    """Load a snapshot if present and compatible, otherwise start empty."""
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as fh:
+            return LocationRollup.from_dict(index, json.load(fh))
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(snapshot_path):
+            print("Ignoring snapshot:", e)
+        return LocationRollup(index)
+
+
+def save_rollup(rollup: LocationRollup, snapshot_path: str) -> None:
+    """Write the rollup snapshot atomically."""
+    os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+    tmp = snapshot_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(rollup.to_dict(), fh)
+    os.replace(tmp, snapshot_path)
+
+
+def main() -> None:
+    """Update the rollup from the registration store and answer one query."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("store", nargs="?", default=STORE_PATH, help="JSONL registration store")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="rollup snapshot file")
+    parser.add_argument("--rebuild", action="store_true", help="recount the full history from scratch")
+    parser.add_argument("--days", type=float, help="only count the last N days")
+    parser.add_argument("--level", choices=LEVELS, default="state", help="level for --top")
+    parser.add_argument("--top", type=int, default=10, help="show the K busiest locations")
+    parser.add_argument("--country", help="point query: country code, e.g. IN")
+    parser.add_argument("--state", help="point query: state name")
+    parser.add_argument("--city", help="point query: city name")
+    args = parser.parse_args()
+
+    index = LocationIndex(load_data())
+    start = time.perf_counter()
+    if args.rebuild:
+        rollup = LocationRollup(index)
+    else:
+        rollup = load_rollup(index, args.snapshot)
+    counted = catch_up(rollup, args.store)
+    save_rollup(rollup, args.snapshot)
+    elapsed = time.perf_counter() - start
+    print(f"{'Rebuilt' if args.rebuild else 'Updated'} rollup: +{counted} records in {elapsed * 1000:.1f} ms "
+          f"({rollup.records} total, {rollup.unknown} with unknown location, {rollup.undated} undated)")
+
+    since = time.time() - args.days * DAY if args.days else None
+
+    if args.country:
+        start = time.perf_counter()
+        n = rollup.count(args.country, args.state, args.city, since=since)
+        took_us = (time.perf_counter() - start) * 1e6
+        where = ", ".join(p for p in (args.city, args.state, args.country) if p)
+        print(f"{where}: {n} registrations ({took_us:.1f} µs)")
+        return
+
+    start = time.perf_counter()
+    rows = rollup.top(args.level, args.top, since=since)
+    took_us = (time.perf_counter() - start) * 1e6
+    print(f"Top {args.top} {args.level} ({took_us:.1f} µs):")
+    for label, n in rows:
+        print(f" - {label}: {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""
+Local registration endpoint with admission control.
+
+Accepts the payload built by the submit handler in script.js (plus optional
+phone/phoneCode/password) on POST /register, validates it with the same rules
+as the page, and appends accepted registrations to the JSONL store read by
+registration_analytics.py.
+
+Admission control, checked before any real work is done:
+  - token bucket per client IP              -> 429 reason "ip_rate"
+  - token bucket per email (rate_limit_key) -> 429 reason "email_rate"
+  - bounded global in-flight limit          -> 429 reason "overloaded"
+Every 429 carries Retry-After and is answered without touching the backend,
+so bursts and bot retries cannot queue up in front of legitimate sign-ups.
+
+The client IP is the socket peer unless --trusted-proxies N is given. Then
+it is the N-th X-Forwarded-For entry counted from the right: each trusted
+proxy appends the address it received the request from, so everything left
+of that entry is client-supplied and ignored. A header with fewer than N
+entries did not pass through every proxy and falls back to the peer address.
+
+Counters and latency histograms are kept per handler thread and only merged
+when read, so the request path never takes a metrics lock. GET /metrics
+returns them as JSON.
+
+The storage backend is simulated with a fixed pool of --backend-workers slots
+each held for --work-ms, to stand in for a real database connection pool.
+
+Usage:
+    python registration_server.py --port 8081
+    python registration_server.py --no-admission        # compare behaviour
+See admission_load_test.py for a local overload demonstration.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from data_loader import load_data
+from email_checker import rate_limit_key
+from latency_histogram import LatencyHistogram
+from registration_analytics import STORE_PATH, LocationIndex
+
+MAX_BODY_BYTES = 16 * 1024
+EMAIL_RE = re.compile(r"^\S+@\S+\.\S+$")
+
+
+# ---------------------------------------------------------------------------
+# Validation (mirrors validateForm() in script.js)
+# ---------------------------------------------------------------------------
+
+def validate_phone(country_code: str, phone: str) -> bool:
+    """Same rules as validatePhone() in script.js."""
+    if not phone:
+        return False
+    phone = phone.strip()
+    if country_code and phone.startswith(country_code):
+        rest = re.sub(r"\D", "", phone[len(country_code):])
+        return 6 <= len(rest) <= 12
+    digits = re.sub(r"\D", "", phone)
+    return 7 <= len(digits) <= 12
+
+
+def pwd_strength(password: str) -> int:
+    """Same 0..4 score as pwdStrength() in script.js."""
+    score = 0
+    if len(password) >= 8:
+        score += 1
+    if re.search(r"[A-Z]", password):
+        score += 1
+    if re.search(r"[0-9]", password):
+        score += 1
+    if re.search(r"[^A-Za-z0-9]", password):
+        score += 1
+    return score
+
+
+def validate_payload(payload: dict, index: LocationIndex, disposable: frozenset) -> Dict[str, str]:
+    """Return {field: message} for every invalid field (empty dict when valid).
+
+    phone and password are optional in the payload but validated when present.
+    """
+    errors: Dict[str, str] = {}
+
+    def text(name: str) -> str:
+        value = payload.get(name)
+        return value.strip() if isinstance(value, str) else ""
+
+    if not text("firstName"):
+        errors["firstName"] = "First name is required"
+    if not text("lastName"):
+        errors["lastName"] = "Last name is required"
+
+    email = text("email")
+    if not email:
+        errors["email"] = "Email is required"
+    elif not EMAIL_RE.match(email):
+        errors["email"] = "Enter a valid email"
+    elif email.rpartition("@")[2].lower() in disposable:
+        errors["email"] = "Disposable emails not allowed"
+
+    cid, sid, ci = index.resolve(text("country"), text("state"), text("city"))
+    if cid < 0:
+        errors["country"] = "Country required"
+    elif sid < 0:
+        errors["state"] = "State required"
+    elif ci < 0:
+        errors["city"] = "City required"
+
+    if "phone" in payload and not validate_phone(text("phoneCode"), text("phone")):
+        errors["phone"] = "Invalid phone for selected country or format."
+
+    if "password" in payload:
+        password = payload.get("password") or ""
+        if not isinstance(password, str) or len(password) < 8:
+            errors["password"] = "At least 8 characters"
+        elif pwd_strength(password) < 2:
+            errors["password"] = "Use a stronger password (mix uppercase, digits, symbols)"
+        elif "confirmPassword" in payload and payload.get("confirmPassword") != password:
+            errors["confirmPassword"] = "Passwords do not match"
+
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Admission control
+# ---------------------------------------------------------------------------
+
+class KeyedRateLimiter:
+    """Token bucket per key (refill `rate` tokens/s up to `burst`), LRU-bounded.
+
+    A rate <= 0 disables the limiter.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Take one token for key; returns (allowed, seconds until a token is available)."""
+        if self.rate <= 0:
+            return True, 0.0
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return True, 0.0
+            return False, (1.0 - bucket[0]) / self.rate
+
+
+class AdmissionController:
+    """Per-IP and per-email token buckets plus a global in-flight cap."""
+
+    def __init__(
+        self,
+        ip_rate: float = 5.0,
+        ip_burst: float = 10.0,
+        email_rate: float = 0.2,
+        email_burst: float = 3.0,
+        max_in_flight: int = 64,
+    ):
+        self.by_ip = KeyedRateLimiter(ip_rate, ip_burst)
+        self.by_email = KeyedRateLimiter(email_rate, email_burst)
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+
+    @classmethod
+    def disabled(cls) -> "AdmissionController":
+        """Controller that admits everything (for comparison runs)."""
+        return cls(ip_rate=0, email_rate=0, max_in_flight=0)
+
+    def try_enter(self) -> bool:
+        """Claim an in-flight slot without waiting."""
+        return self._slots is None or self._slots.acquire(blocking=False)
+
+    def leave(self) -> None:
+        """Release a slot claimed by try_enter()."""
+        if self._slots is not None:
+            self._slots.release()
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class Metrics:
+    """Counters and latency histograms sharded per thread.
+
+    Writers only touch their own thread's shard, so the hot path is lock-free;
+    readers merge all shards. Shards of finished threads are folded into a
+    retired total so short-lived handler threads don't accumulate.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired_counters: Counter = Counter()
+        self._retired_latency: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def _shard(self) -> tuple:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = (threading.current_thread(), Counter(), {})
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+                if len(self._shards) > 256:
+                    self._fold_dead()
+        return shard
+
+    def _fold_dead(self) -> None:
+        """Merge shards of exited threads into the retired totals (lock held)."""
+        alive = []
+        for shard in self._shards:
+            thread, counters, latency = shard
+            if thread.is_alive():
+                alive.append(shard)
+                continue
+            self._retired_counters.update(counters)
+            for name, hist in latency.items():
+                self._retired_latency.setdefault(name, LatencyHistogram()).merge(hist)
+        self._shards = alive
+
+    def incr(self, name: str, n: int = 1) -> None:
+        """Increment a counter."""
+        self._shard()[1][name] += n
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a latency sample in the named histogram."""
+        latency = self._shard()[2]
+        hist = latency.get(name)
+        if hist is None:
+            hist = latency[name] = LatencyHistogram()
+        hist.record(seconds)
+
+    def snapshot(self) -> dict:
+        """Merged view of all counters and latency summaries."""
+        with self._lock:
+            self._fold_dead()
+            counters = Counter(self._retired_counters)
+            latency = {name: LatencyHistogram().merge(h) for name, h in self._retired_latency.items()}
+            for _, shard_counters, shard_latency in self._shards:
+                counters.update(shard_counters.copy())
+                for name, hist in list(shard_latency.items()):
+                    latency.setdefault(name, LatencyHistogram()).merge(hist)
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "counters": dict(sorted(counters.items())),
+            "latency": {name: hist.summary() for name, hist in sorted(latency.items())},
+        }
+
+
+# ---------------------------------------------------------------------------
+# Backend
+# ---------------------------------------------------------------------------
+
+class Backend:
+    """Simulated storage: a fixed pool of workers, each busy for work_ms per write."""
+
+    def __init__(self, store_path: Optional[str], workers: int = 8, work_ms: float = 0.0):
+        self.store_path = store_path
+        self.work_s = work_ms / 1000.0
+        self._pool = threading.BoundedSemaphore(max(1, workers))
+        self._write_lock = threading.Lock()
+
+    def save(self, record: dict) -> None:
+        """Persist one accepted registration."""
+        with self._pool:
+            if self.work_s:
+                time.sleep(self.work_s)
+            if self.store_path:
+                line = json.dumps(record, separators=(",", ":")) + "\n"
+                with self._write_lock, open(self.store_path, "a", encoding="utf-8") as fh:
+                    fh.write(line)
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class RegistrationServer(ThreadingHTTPServer):
+    """Threaded HTTP server carrying the shared validation/admission state."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        admission: AdmissionController,
+        backend: Backend,
+        trusted_proxies: int = 0,
+        verbose: bool = False,
+    ):
+        super().__init__(address, RegistrationHandler)
+        data = load_data()
+        self.index = LocationIndex(data)
+        self.disposable = frozenset(d.lower() for d in data.get("disposableDomains", []))
+        self.admission = admission
+        self.backend = backend
+        self.metrics = Metrics()
+        self.trusted_proxies = trusted_proxies
+        self.verbose = verbose
+
+
+class RegistrationHandler(BaseHTTPRequestHandler):
+    """Routes /register, /metrics and /health."""
+
+    server_version = "RegistrationServer/1.0"
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    server: RegistrationServer
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - signature from base class
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _client_ip(self) -> str:
+        hops = self.server.trusted_proxies
+        if hops > 0:
+            # entries left of the one our outermost proxy appended are client-controlled
+            forwarded = [ip.strip() for ip in self.headers.get("X-Forwarded-For", "").split(",")]
+            if len(forwarded) >= hops and forwarded[-hops]:
+                return forwarded[-hops]
+        return self.client_address[0]
+
+    def _reject(self, reason: str, retry_after: float, started: float) -> None:
+        metrics = self.server.metrics
+        metrics.incr("rejected")
+        metrics.incr("rejected_" + reason)
+        self._send_json(
+            429,
+            {"ok": False, "error": "rate_limited", "reason": reason},
+            {"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+        metrics.observe("rejected", time.perf_counter() - started)
+
+    def do_OPTIONS(self) -> None:
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "POST, GET, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            self._send_json(200, self.server.metrics.snapshot())
+        elif self.path == "/health":
+            self._send_json(200, {"ok": True})
+        else:
+            self._send_json(404, {"ok": False, "error": "not_found"})
+
+    def do_POST(self) -> None:
+        started = time.perf_counter()
+        server = self.server
+        metrics = server.metrics
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"ok": False, "error": "payload_too_large"})
+            return
+        body = self.rfile.read(length)
+
+        if self.path != "/register":
+            self._send_json(404, {"ok": False, "error": "not_found"})
+            return
+        metrics.incr("requests")
+
+        # cheapest checks first: nothing below runs for a rejected client
+        allowed, retry = server.admission.by_ip.allow(self._client_ip())
+        if not allowed:
+            self._reject("ip_rate", retry, started)
+            return
+        if not server.admission.try_enter():
+            self._reject("overloaded", 1.0, started)
+            return
+        try:
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                payload = None
+            if not isinstance(payload, dict):
+                metrics.incr("bad_request")
+                self._send_json(400, {"ok": False, "error": "invalid_json"})
+                return
+
+            email = payload.get("email")
+            if isinstance(email, str) and email.strip():
+                allowed, retry = server.admission.by_email.allow(rate_limit_key(email))
+                if not allowed:
+                    self._reject("email_rate", retry, started)
+                    return
+
+            errors = validate_payload(payload, server.index, server.disposable)
+            if errors:
+                metrics.incr("invalid")
+                self._send_json(422, {"ok": False, "errors": errors})
+                metrics.observe("invalid", time.perf_counter() - started)
+                return
+
+            record = {
+                key: payload[key].strip()
+                for key in ("firstName", "lastName", "email", "country", "state", "city")
+            }
+            record["submittedAt"] = time.time()
+            server.backend.save(record)
+            metrics.incr("accepted")
+            self._send_json(201, {"ok": True})
+            metrics.observe("accepted", time.perf_counter() - started)
+        finally:
+            server.admission.leave()
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8081,
+    admission: Optional[AdmissionController] = None,
+    store_path: Optional[str] = STORE_PATH,
+    backend_workers: int = 8,
+    work_ms: float = 0.0,
+    trusted_proxies: int = 0,
+    verbose: bool = False,
+) -> RegistrationServer:
+    """Build a server (port 0 picks a free port); call serve_forever() to run it."""
+    return RegistrationServer(
+        (host, port),
+        admission or AdmissionController(),
+        Backend(store_path, backend_workers, work_ms),
+        trusted_proxies=trusted_proxies,
+        verbose=verbose,
+    )
+
+
+def main() -> None:
+    """Run the registration endpoint until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--store", default=STORE_PATH, help="JSONL file for accepted registrations")
+    parser.add_argument("--ip-rate", type=float, default=5.0, help="requests/s per client IP (0 = off)")
+    parser.add_argument("--ip-burst", type=float, default=10.0)
+    parser.add_argument("--email-rate", type=float, default=0.2, help="requests/s per email (0 = off)")
+    parser.add_argument("--email-burst", type=float, default=3.0)
+    parser.add_argument("--max-in-flight", type=int, default=64, help="global concurrent requests (0 = off)")
+    parser.add_argument("--no-admission", action="store_true", help="disable all admission control")
+    parser.add_argument("--backend-workers", type=int, default=8)
+    parser.add_argument("--work-ms", type=float, default=0.0, help="simulated backend time per write")
+    parser.add_argument("--trusted-proxies", type=int, default=0,
+                        help="reverse proxies in front of the server; client IP is taken from X-Forwarded-For")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    if args.no_admission:
+        admission = AdmissionController.disabled()
+    else:
+        admission = AdmissionController(
+            args.ip_rate, args.ip_burst, args.email_rate, args.email_burst, args.max_in_flight
+        )
+    server = make_server(
+        args.host,
+        args.port,
+        admission,
+        args.store,
+        args.backend_workers,
+        args.work_ms,
+        args.trusted_proxies,
+        args.verbose,
+    )
+    print(f"Registration endpoint on http://{args.host}:{server.server_address[1]}/register")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Final metrics:", json.dumps(server.metrics.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Tests for the pre-rendering in build_index.py."""
+
+import pytest
+
+from build_index import PLACEHOLDERS, build, prerender, render_options
+
+DATA = {
+    "countries": [
+        {"code": "IN", "name": "India", "phoneCode": "+91", "states": []},
+        {"code": "XX", "name": "Trinidad & <Tobago>", "phoneCode": "+1\"868", "states": []},
+    ]
+}
+
+PAGE = """<form>
+          <select id="country" required></select>
+          <select id="state" required>
+          </select>
+          <select id="city" required></select>
+            <select id="phoneCode" aria-label="country code"></select>
+</form>"""
+
+
+def test_render_options_matches_script_js_order():
+    options = render_options(DATA)
+    assert options["country"] == [
+        '<option value="">-- Select Country --</option>',
+        '<option value="IN">India</option>',
+        '<option value="XX">Trinidad &amp; &lt;Tobago&gt;</option>',
+    ]
+    assert options["phoneCode"][1] == '<option value="+91">India (+91)</option>'
+    assert options["state"] == ['<option value="">-- Select State --</option>']
+    assert options["city"] == ['<option value="">-- Select City --</option>']
+
+
+def test_values_and_text_are_escaped():
+    option = render_options(DATA)["phoneCode"][2]
+    assert option == '<option value="+1&quot;868">Trinidad &amp; &lt;Tobago&gt; (+1&quot;868)</option>'
+
+
+def test_prerender_fills_every_empty_select():
+    page = prerender(PAGE, DATA)
+    for placeholder in PLACEHOLDERS.values():
+        assert placeholder in page
+    assert page.count("<option") == 3 + 3 + 1 + 1
+    assert '<select id="country" required>\n' in page
+    assert 'aria-label="country code">' in page
+    assert page.count("</select>") == 4
+
+
+def test_prerender_requires_all_selects():
+    with pytest.raises(ValueError, match="phoneCode"):
+        prerender(PAGE.replace('<select id="phoneCode" aria-label="country code"></select>', ""), DATA)
+
+
+def test_prerender_ignores_already_filled_select():
+    page = PAGE.replace('<select id="city" required></select>',
+                        '<select id="city" required><option>x</option></select>')
+    with pytest.raises(ValueError, match="city"):
+        prerender(page, DATA)
+
+
+def test_build_writes_site(tmp_path):
+    index = build(str(tmp_path / "dist"))
+    html = open(index, encoding="utf-8").read()
+    assert '<option value="IN">India</option>' in html
+    for name in ("data.js", "script.js", "index.css"):
+        assert (tmp_path / "dist" / name).is_file()
@@ -0,0 +1,124 @@
+"""Tests for driver_resolver.py (no browser needed)."""
+
+import os
+import stat
+import sys
+
+import pytest
+
+import driver_resolver
+from driver_resolver import DRIVER_NAME, binary_version, version_key
+
+
+def make_driver(path, version: str = "120.0.6099.109"):
+    """A fake executable chromedriver that prints version."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"#!/bin/sh\necho 'ChromeDriver {version} (abc)'\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+needs_sh = pytest.mark.skipif(sys.platform.startswith("win"), reason="fake drivers are shell scripts")
+
+
+@pytest.fixture
+def caches(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    wdm = tmp_path / "wdm"
+    monkeypatch.setattr(driver_resolver, "CACHE_DIR", str(cache))
+    monkeypatch.setattr(driver_resolver, "FINGERPRINT_FILE", str(cache / "fingerprints.json"))
+    monkeypatch.setattr(driver_resolver, "WDM_CACHE_DIR", str(wdm))
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    monkeypatch.setattr(driver_resolver.shutil, "which", lambda name: None)
+    return cache, wdm
+
+
+def test_version_key_orders_numerically():
+    paths = [
+        "/c/99.0.4844.51/chromedriver",
+        "/c/120.0.6099.109/chromedriver",
+        "/c/120.0.6099.71/chromedriver",
+        "/w/linux64/114.0.5735.90/chromedriver-linux64/chromedriver",
+        "/c/chromedriver",
+    ]
+    assert sorted(paths, key=version_key, reverse=True) == [
+        "/c/120.0.6099.109/chromedriver",
+        "/c/120.0.6099.71/chromedriver",
+        "/w/linux64/114.0.5735.90/chromedriver-linux64/chromedriver",
+        "/c/99.0.4844.51/chromedriver",
+        "/c/chromedriver",
+    ]
+
+
+def test_binary_version_uses_cache_until_file_changes(tmp_path, monkeypatch):
+    path = make_driver(tmp_path / DRIVER_NAME)
+    calls = []
+    monkeypatch.setattr(driver_resolver, "_probe_version", lambda p: calls.append(p) or "120.0.1.2")
+    fingerprints = {}
+    assert binary_version(path, fingerprints) == "120.0.1.2"
+    assert binary_version(path, fingerprints) == "120.0.1.2"
+    assert len(calls) == 1
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    binary_version(path, fingerprints)
+    assert len(calls) == 2
+
+    with open(path, "a") as fh:
+        fh.write("# grown\n")
+    binary_version(path, fingerprints)
+    assert len(calls) == 3
+
+
+def test_failed_probe_is_not_cached(tmp_path, monkeypatch):
+    path = make_driver(tmp_path / DRIVER_NAME)
+    results = iter(["", "120.0.1.2"])
+    monkeypatch.setattr(driver_resolver, "_probe_version", lambda p: next(results))
+    fingerprints = {}
+    assert binary_version(path, fingerprints) == ""
+    assert fingerprints == {}
+    assert binary_version(path, fingerprints) == "120.0.1.2"
+    assert fingerprints[os.path.abspath(path)]["version"] == "120.0.1.2"
+
+
+def test_candidates_priority(caches, tmp_path, monkeypatch):
+    cache, wdm = caches
+    old = make_driver(cache / "99.0.4844.51" / DRIVER_NAME)
+    new = make_driver(cache / "120.0.6099.109" / DRIVER_NAME)
+    managed = make_driver(wdm / "linux64" / "114.0.5735.90" / DRIVER_NAME)
+    on_path = make_driver(tmp_path / "bin" / DRIVER_NAME)
+    monkeypatch.setenv("CHROMEDRIVER_PATH", "/opt/override/chromedriver")
+    monkeypatch.setattr(driver_resolver.shutil, "which", lambda name: on_path)
+
+    assert list(driver_resolver._candidates()) == [
+        ("env", "/opt/override/chromedriver"),
+        ("cache", new),
+        ("cache", old),
+        ("cache", managed),
+        ("PATH", on_path),
+    ]
+
+
+@needs_sh
+def test_resolve_prefers_matching_major(caches, monkeypatch):
+    cache, _ = caches
+    make_driver(cache / "121.0.1.1" / DRIVER_NAME, "121.0.1.1")
+    match = make_driver(cache / "120.0.6099.109" / DRIVER_NAME)
+    browser = make_driver(cache.parent / "chrome", "120.0.6099.5")
+    monkeypatch.setattr(driver_resolver, "find_browser", lambda: browser)
+    assert driver_resolver.resolve_chromedriver(allow_download=False, verbose=False) == match
+
+
+@needs_sh
+def test_unusable_override_warns(caches, monkeypatch, capsys):
+    cache, _ = caches
+    fallback = make_driver(cache / "120.0.6099.109" / DRIVER_NAME)
+    monkeypatch.setenv("CHROMEDRIVER_PATH", str(cache / "missing"))
+    monkeypatch.setattr(driver_resolver, "find_browser", lambda: None)
+    assert driver_resolver.resolve_chromedriver(allow_download=False) == fallback
+    assert "CHROMEDRIVER_PATH" in capsys.readouterr().out
+
+
+def test_nothing_found_without_download(caches, monkeypatch):
+    monkeypatch.setattr(driver_resolver, "find_browser", lambda: None)
+    with pytest.raises(driver_resolver.DriverResolutionError):
+        driver_resolver.resolve_chromedriver(allow_download=False, verbose=False)
@@ -0,0 +1,104 @@
+"""Tests for address normalisation in email_checker.py."""
+
+import pytest
+
+from email_checker import EmailChecker, normalise_address, rate_limit_key
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("J.Doe+news@Gmail.com", "jdoe@gmail.com"),
+    ("j.d.o.e@googlemail.com", "jdoe@gmail.com"),
+    ("Jane+work@Outlook.com", "jane@outlook.com"),
+    ("jane+x@hotmail.com", "jane@hotmail.com"),
+    ("Jane.Doe+x@icloud.com", "jane.doe@icloud.com"),
+    ("bob+tag@proton.me", "bob@proton.me"),
+    ("Bob-spam@Yahoo.com", "bob@yahoo.com"),
+    ("bob+keep@yahoo.com", "bob+keep@yahoo.com"),
+    ("gmail.com.user@gmail.com.", "gmailcomuser@gmail.com"),
+])
+def test_provider_rules(address, expected):
+    assert normalise_address(address) == expected
+
+
+def test_other_domains_keep_local_part():
+    # case and tags may be significant on unknown providers
+    assert normalise_address("Bot+1@Example.com") == "Bot+1@example.com"
+    assert normalise_address("first.last@example.org") == "first.last@example.org"
+
+
+def test_idna_domain():
+    assert normalise_address("user@Bücher.example") == "user@xn--bcher-kva.example"
+
+
+def test_unparseable_input():
+    assert normalise_address("  Not-An-Address ") == "not-an-address"
+    assert normalise_address("@example.com") == "@example.com"
+
+
+def test_rate_limit_key_ignores_case_and_tags_everywhere():
+    assert rate_limit_key("Bot+1@Example.com") == rate_limit_key("bot+2@example.com") == "bot@example.com"
+    assert rate_limit_key("J.Doe+x@GoogleMail.com") == "jdoe@gmail.com"
+    assert rate_limit_key("Bob-spam@yahoo.com") == "bob@yahoo.com"
+
+
+def test_domain_verdicts_are_memoised():
+    checker = EmailChecker(["mailinator.com"])
+    for n in range(5):
+        checker.check(f"user{n}@Example.com")
+    checker.check("x@mailinator.com")
+    info = checker.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (4, 2, 2)
+    checker.clear_cache()
+    assert checker.cache_info().currsize == 0
+
+
+def test_lru_is_bounded():
+    checker = EmailChecker(cache_size=2)
+    for domain in ("a.com", "b.com", "c.com", "a.com"):
+        checker.check(f"x@{domain}")
+    info = checker.cache_info()
+    assert info.currsize == 2
+    assert info.misses == 4
+
+
+def test_cache_size_zero_still_checks():
+    checker = EmailChecker(["mailinator.com"], cache_size=0)
+    verdicts = [checker.check(a) for a in ("a@gmail.com", "a@gmail.com", "b@mailinator.com")]
+    assert [v.reason for v in verdicts] == ["", "", "disposable"]
+    info = checker.cache_info()
+    assert (info.hits, info.currsize) == (0, 0)
+
+
+@pytest.mark.parametrize("address, reason", [
+    ("a@mailinator.com", "disposable"),
+    ("a@inbox.mailinator.com", "disposable"),
+    ("a@MAILINATOR.COM.", "disposable"),
+    ("a@notmailinator.com", ""),
+    ("a@mailinator.com.example.org", ""),
+    ("a@bad_domain", "domain"),
+    ("no-at-sign", "syntax"),
+    ("sp ace@example.com", "syntax"),
+])
+def test_verdict_reasons(address, reason):
+    verdict = EmailChecker(["mailinator.com"]).check(address)
+    assert verdict.reason == reason
+    assert verdict.valid == (reason == "")
+
+
+def test_check_many_skips_blank_lines():
+    verdicts = list(EmailChecker().check_many(["a@example.com\n", "   \n", "", "b@example.com"]))
+    assert [v.address for v in verdicts] == ["a@example.com", "b@example.com"]
+
+
+def test_check_many_is_lazy():
+    consumed = []
+
+    def source():
+        for n in range(1000):
+            consumed.append(n)
+            yield f"user{n}@example.com"
+
+    verdicts = EmailChecker().check_many(source())
+    assert consumed == []
+    assert next(verdicts).address == "user0@example.com"
+    assert len(consumed) == 1
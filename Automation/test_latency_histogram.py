@@ -0,0 +1,124 @@
+"""Tests for latency_histogram.py."""
+
+import math
+import random
+import sys
+import threading
+
+import pytest
+
+from latency_histogram import SUB_BUCKET_COUNT, LatencyHistogram, bucket_index, bucket_upper, merged
+
+
+def test_small_values_are_exact():
+    for value in range(SUB_BUCKET_COUNT):
+        assert bucket_index(value) == value
+        assert bucket_upper(value) == value
+
+
+def test_bucket_round_trip():
+    values = list(range(SUB_BUCKET_COUNT, 70_000)) + [random.Random(1).randrange(1, 10**9) for _ in range(5000)]
+    for value in values:
+        idx = bucket_index(value)
+        upper = bucket_upper(idx)
+        assert value <= upper
+        assert bucket_index(upper) == idx
+        assert bucket_index(upper + 1) == idx + 1
+        # log-linear: bucket width stays within ~1.6 % of the value
+        assert upper - value <= value / 64
+
+
+def test_bucket_index_is_monotonic():
+    indexes = [bucket_index(v) for v in range(100_000)]
+    assert all(b - a in (0, 1) for a, b in zip(indexes, indexes[1:]))
+
+
+def test_percentile_empty():
+    assert LatencyHistogram().percentile(99) == 0
+
+
+def test_percentile_exact_range():
+    hist = LatencyHistogram()
+    for value in range(1, 101):
+        hist.record_us(value)
+    assert hist.percentile(50) == 50
+    assert hist.percentile(99) == 99
+    assert hist.percentile(100) == 100
+    assert hist.percentile(0) == 1
+
+
+def test_percentile_within_bucket_error():
+    rng = random.Random(7)
+    samples = sorted(rng.randrange(1, 2_000_000) for _ in range(20_000))
+    hist = LatencyHistogram()
+    for value in samples:
+        hist.record_us(value)
+    for pct in (50, 90, 99, 99.9):
+        exact = samples[max(1, math.ceil(len(samples) * pct / 100)) - 1]
+        assert exact <= hist.percentile(pct) <= exact * 1.016
+
+
+def test_percentile_capped_at_max():
+    hist = LatencyHistogram()
+    hist.record_us(1000)
+    assert hist.percentile(100) == 1000
+
+
+def test_merge_and_summary():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    a.record(0.001)
+    b.record(0.003)
+    total = merged([a, b])
+    assert total.total == 2
+    assert total.mean_us() == pytest.approx(2000)
+    summary = total.summary()
+    assert summary["count"] == 2
+    assert summary["max_ms"] == 3.0
+    assert set(summary) == {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "p999_ms", "max_ms"}
+
+
+
+class _GrowingCounts(list):
+    """counts list that gains buckets while being iterated, like a concurrent record_us()."""
+
+    def __iter__(self):
+        i = 0
+        while i < len(self):
+            if i == 1:
+                self.extend([1] * 100)
+            yield self[i]
+            i += 1
+
+
+def test_merge_tolerates_source_growing_mid_merge():
+    source = LatencyHistogram()
+    source.record_us(1)
+    source.counts = _GrowingCounts(source.counts)
+    target = LatencyHistogram().merge(source)
+    assert target.counts[1] == 1
+
+
+def test_merge_while_source_is_recording():
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(50):
+            source = LatencyHistogram()
+            stop = threading.Event()
+
+            def record():
+                value = 1
+                while not stop.is_set() and value < 10**15:
+                    source.record_us(value)
+                    value += value // 8 + 1
+
+            writer = threading.Thread(target=record)
+            writer.start()
+            try:
+                while writer.is_alive():
+                    LatencyHistogram().merge(source)
+            finally:
+                stop.set()
+                writer.join()
+    finally:
+        sys.setswitchinterval(switch)
@@ -0,0 +1,112 @@
+"""Tests for load_generator.py (no server process needed)."""
+
+import asyncio
+
+import pytest
+
+from data_loader import load_data
+from load_generator import (
+    INVALID_KINDS, HttpConnection, LoadGenerator, PayloadFactory, RunStats, saturation_point,
+)
+from registration_server import LocationIndex, validate_payload
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_data()
+
+
+@pytest.fixture(scope="module")
+def validator(data):
+    index = LocationIndex(data)
+    disposable = frozenset(d.lower() for d in data.get("disposableDomains", []))
+    return lambda payload: validate_payload(payload, index, disposable)
+
+
+def test_valid_payloads_pass_server_validation(data, validator):
+    factory = PayloadFactory(data, seed=1)
+    for _ in range(500):
+        assert validator(factory.valid()) == {}
+
+
+@pytest.mark.parametrize("kind", INVALID_KINDS)
+def test_every_invalid_kind_is_rejected(data, validator, kind):
+    factory = PayloadFactory(data, seed=2)
+    for _ in range(50):
+        assert validator(factory.invalid(kind)), kind
+
+
+def read_response(raw: bytes):
+    """Feed raw bytes to HttpConnection._read_response; returns (status, body fully read)."""
+    async def run():
+        conn = HttpConnection("127.0.0.1", 0, 1.0)
+        conn.reader = asyncio.StreamReader()
+        conn.reader.feed_data(raw)
+        conn.reader.feed_eof()
+        status = await conn._read_response()
+        return status, conn.reader.at_eof()
+    return asyncio.run(run())
+
+
+def test_read_response_consumes_body():
+    status, at_eof = read_response(
+        b"HTTP/1.1 201 Created\r\nContent-Type: application/json\r\nContent-Length: 11\r\n\r\n{\"ok\":true}"
+    )
+    assert status == 201
+    assert at_eof
+
+
+def test_read_response_without_body():
+    status, _ = read_response(b"HTTP/1.1 429 Too Many Requests\r\nRetry-After: 1\r\n\r\n")
+    assert status == 429
+
+
+def test_read_response_truncated_body():
+    with pytest.raises(asyncio.IncompleteReadError):
+        read_response(b"HTTP/1.1 201 Created\r\nContent-Length: 100\r\n\r\nshort")
+
+
+def test_read_response_closed_connection():
+    with pytest.raises(ConnectionError):
+        read_response(b"")
+
+
+def run_stats(label: str, throughput: float) -> RunStats:
+    stats = RunStats(label)
+    stats.statuses[201] = int(throughput * 10)
+    stats.elapsed = 10.0
+    return stats
+
+
+def ramp_with(data, throughputs, max_concurrency):
+    """Run ramp() against canned closed-loop throughputs; returns the concurrencies tried."""
+    generator = LoadGenerator("http://127.0.0.1:1/register", PayloadFactory(data))
+    tried = []
+
+    async def closed_loop(concurrency, duration):
+        tried.append(concurrency)
+        return run_stats(f"c={concurrency}", throughputs[len(tried) - 1])
+
+    generator.closed_loop = closed_loop
+    results = asyncio.run(generator.ramp(max_concurrency, 0.0))
+    return tried, results
+
+
+def test_ramp_stops_when_gain_falls_below_threshold(data, capsys):
+    tried, results = ramp_with(data, [100, 190, 300, 310, 500], max_concurrency=64)
+    assert tried == [1, 2, 4, 8]
+    assert saturation_point(results).label == "c=8"
+
+
+def test_ramp_stops_at_max_concurrency(data, capsys):
+    tried, results = ramp_with(data, [100, 200, 400, 800], max_concurrency=8)
+    assert tried == [1, 2, 4, 8]
+    # still growing at the last step: no saturation point
+    assert saturation_point(results) is None
+
+
+def test_saturation_point_is_best_step():
+    results = [run_stats("c=1", 100), run_stats("c=2", 300), run_stats("c=4", 250)]
+    assert saturation_point(results).label == "c=2"
+    assert saturation_point([]) is None
+    assert saturation_point(results[:1]) is None
@@ -0,0 +1,111 @@
+"""Tests for location_normaliser.py."""
+
+import random
+
+from data_loader import load_data
+from location_normaliser import ALIASES, BKTree, LocationNormaliser, levenshtein, normalise_lines
+
+
+def naive_levenshtein(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def random_pairs(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    alphabet = "abcdeé "
+    for _ in range(count):
+        a = "".join(rng.choices(alphabet, k=rng.randrange(0, 20)))
+        b = "".join(rng.choices(alphabet, k=rng.randrange(0, 20)))
+        yield a, b
+
+
+def test_levenshtein_matches_naive_dp():
+    for a, b in random_pairs(5000):
+        assert levenshtein(a, b) == naive_levenshtein(a, b), (a, b)
+
+
+def test_levenshtein_long_strings():
+    # longer than a machine word: Python ints keep the bit-parallel masks exact
+    rng = random.Random(5)
+    for _ in range(50):
+        a = "".join(rng.choices("acgt", k=rng.randrange(60, 150)))
+        b = "".join(rng.choices("acgt", k=rng.randrange(60, 150)))
+        assert levenshtein(a, b) == naive_levenshtein(a, b)
+
+
+def test_levenshtein_edge_cases():
+    assert levenshtein("", "") == 0
+    assert levenshtein("", "abc") == 3
+    assert levenshtein("abc", "") == 3
+    assert levenshtein("kitten", "sitting") == 3
+
+
+def test_bktree_search_matches_brute_force():
+    rng = random.Random(9)
+    words = sorted({"".join(rng.choices("abcd", k=rng.randrange(1, 8))) for _ in range(500)})
+    tree = BKTree()
+    for i, word in enumerate(words):
+        tree.add(word, i)
+    for query in ("abc", "dddd", "a", "bacabad"):
+        for radius in (0, 1, 2):
+            found = sorted((d, key) for d, key, _ in tree.search(query, radius))
+            expected = sorted((d, w) for w in words if (d := naive_levenshtein(query, w)) <= radius)
+            assert found == expected
+
+
+DATA = {
+    "countries": [
+        {"code": "IN", "name": "India", "phoneCode": "+91", "states": [
+            {"name": "Karnataka", "cities": ["Bengaluru", "Mangalore", "Mysore"]},
+            {"name": "Tamil Nadu", "cities": ["Chennai", "Tiruchirappalli", "Salem"]},
+            {"name": "Kerala", "cities": ["Kochi", "Kozhikode"]},
+        ]},
+    ]
+}
+
+
+def test_resolve_misspelling_and_alias():
+    normaliser = LocationNormaliser(DATA)
+    best = normaliser.resolve("Banglore")[0]
+    assert (best.city, best.state, best.country) == ("Bengaluru", "Karnataka", "IN")
+    assert normaliser.resolve("Trichy")[0].city == "Tiruchirappalli"
+    assert normaliser.resolve("qqqqqqqq") == []
+
+
+def test_resolve_address_prefers_city_confirmed_by_state():
+    best = LocationNormaliser(DATA).resolve_address("flat 3, Koch, Kerala")[0]
+    assert (best.city, best.state) == ("Kochi", "Kerala")
+
+
+def test_normalise_lines_keeps_order_across_workers():
+    lines = ["Banglore", "", "Trichy", "Salem road"] * 50
+    serial = list(normalise_lines(lines, workers=1, data=DATA, chunk_size=7))
+    parallel = list(normalise_lines(lines, workers=2, data=DATA, chunk_size=7))
+    assert serial == parallel
+    assert len(serial) == len(lines)
+    assert serial[0].split("\t")[1] == "Bengaluru"
+    assert serial[1] == "\t\t\t\t0"
+
+
+def test_real_data_aliases_resolve():
+    normaliser = LocationNormaliser(load_data())
+    assert normaliser.resolve("Trichy")[0].city == "Tiruchirappalli"
+
+
+def test_alias_targets_exist_in_data():
+    data = load_data()
+    names = {state["name"] for country in data["countries"] for state in country["states"]}
+    names.update(city for country in data["countries"] for state in country["states"] for city in state["cities"])
+    assert sorted(target for target in ALIASES.values() if target not in names) == []
+
+
+def test_tabs_in_input_do_not_shift_columns():
+    rows = list(normalise_lines(["Trichy\tTamil Nadu", "a\tb\tc"], workers=1, data=DATA))
+    assert [len(row.split("\t")) for row in rows] == [5, 5]
+    assert rows[0].split("\t")[:2] == ["Trichy Tamil Nadu", "Tiruchirappalli"]
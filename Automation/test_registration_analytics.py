@@ -0,0 +1,98 @@
+"""Tests for LocationRollup in registration_analytics.py."""
+
+import pytest
+
+from registration_analytics import DAY, LocationIndex, LocationRollup
+
+DATA = {
+    "countries": [
+        {"code": "IN", "name": "India", "phoneCode": "+91", "states": [
+            {"name": "Telangana", "cities": ["Hyderabad", "Warangal"]},
+            {"name": "Karnataka", "cities": ["Bengaluru"]},
+        ]},
+        {"code": "US", "name": "United States", "phoneCode": "+1", "states": [
+            {"name": "Texas", "cities": ["Austin"]},
+        ]},
+    ]
+}
+T0 = 100 * DAY
+
+
+def record(state, city, country="IN", at=None):
+    rec = {"country": country, "state": state, "city": city}
+    if at is not None:
+        rec["submittedAt"] = at
+    return rec
+
+
+@pytest.fixture
+def rollup():
+    r = LocationRollup(LocationIndex(DATA))
+    r.add_many([
+        record("Telangana", "Hyderabad", at=T0),
+        record("Telangana", "Hyderabad", at=T0 + 2 * DAY),
+        record("Telangana", "Warangal", at=T0 + 2 * DAY),
+        record("Karnataka", "Bengaluru", at=T0 + 5 * DAY),
+        record("Texas", "Austin", country="US", at=T0 + 5 * DAY),
+        record("Karnataka", "Bengaluru"),  # no submittedAt
+        record("Nowhere", "Atlantis"),
+    ])
+    return r
+
+
+def test_totals(rollup):
+    assert rollup.count() == 6
+    assert rollup.unknown == 1
+    assert rollup.undated == 1
+    assert rollup.count("IN") == 5
+    assert rollup.count("IN", "Telangana") == 3
+    assert rollup.count("IN", "Karnataka", "Bengaluru") == 2
+    assert rollup.count("IN", "Gujarat") == 0
+
+
+def test_count_time_range(rollup):
+    assert rollup.count(since=T0 + DAY) == 4
+    assert rollup.count("IN", "Telangana", since=T0 + DAY) == 2
+    assert rollup.count("IN", "Telangana", until=T0 + DAY) == 1
+    # bucket granularity: a range inside a day covers the whole day
+    assert rollup.count("IN", "Telangana", "Hyderabad", since=T0 + 2.5 * DAY, until=T0 + 2.6 * DAY) == 1
+
+
+def test_undated_records_stay_out_of_time_ranges(rollup):
+    assert rollup.count("IN", "Karnataka", since=0) == 1
+    assert rollup.top("state", 1, since=0) == [("Telangana, IN", 3)]
+
+
+def test_top(rollup):
+    assert rollup.top("state", 2) == [("Telangana, IN", 3), ("Karnataka, IN", 2)]
+    assert sorted(rollup.top("country", 5, since=T0 + 5 * DAY)) == [("IN", 1), ("US", 1)]
+    assert rollup.top("city", 1, until=T0 + DAY) == [("Hyderabad, Telangana, IN", 1)]
+
+
+def test_rebuild_gives_same_answers(rollup):
+    rebuilt = LocationRollup(rollup.index)
+    rebuilt.add_many([record("Karnataka", "Bengaluru")])
+    before = rebuilt.count("IN", since=0)
+    rebuilt.rebuild([record("Karnataka", "Bengaluru")])
+    assert rebuilt.count("IN", since=0) == before == 0
+    assert rebuilt.count("IN") == 1
+
+
+def test_snapshot_round_trip(rollup):
+    restored = LocationRollup.from_dict(rollup.index, rollup.to_dict())
+    assert restored.count("IN", "Telangana", since=T0 + DAY) == 2
+    assert restored.undated == 1
+    assert restored.top("state", 2) == rollup.top("state", 2)
+
+
+def test_range_outside_history_and_sparse_buckets():
+    r = LocationRollup(LocationIndex(DATA))
+    for day in (0, 1, 2, 500, 1000):
+        r.add(record("Telangana", "Hyderabad", at=T0 + day * DAY))
+    assert r.count("IN", since=T0 - 10 * DAY, until=T0 - DAY) == 0
+    assert r.count("IN", since=T0 + 1001 * DAY) == 0
+    assert r.count("IN", since=T0 + DAY, until=T0 + 2 * DAY) == 2
+    assert r.count("IN", since=T0 + 3 * DAY, until=T0 + 999 * DAY) == 1
+    assert r.count("IN", since=0) == 5
+    restored = LocationRollup.from_dict(r.index, r.to_dict())
+    assert restored.count("IN", since=T0 + 400 * DAY) == 2
@@ -0,0 +1,92 @@
+"""Tests for the admission control in registration_server.py."""
+
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from registration_server import AdmissionController, KeyedRateLimiter, make_server
+
+
+def test_burst_then_reject():
+    limiter = KeyedRateLimiter(rate=1.0, burst=3)
+    assert [limiter.allow("ip", now=0.0)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_retry_after_until_next_token():
+    limiter = KeyedRateLimiter(rate=2.0, burst=1)
+    assert limiter.allow("ip", now=0.0) == (True, 0.0)
+    allowed, retry = limiter.allow("ip", now=0.1)
+    assert not allowed
+    assert retry == pytest.approx(0.4)
+
+
+def test_refill_over_time():
+    limiter = KeyedRateLimiter(rate=1.0, burst=2)
+    limiter.allow("ip", now=0.0)
+    limiter.allow("ip", now=0.0)
+    assert not limiter.allow("ip", now=0.5)[0]
+    assert limiter.allow("ip", now=1.5)[0]
+    assert not limiter.allow("ip", now=1.5)[0]
+
+
+def test_refill_capped_at_burst():
+    limiter = KeyedRateLimiter(rate=10.0, burst=2)
+    limiter.allow("ip", now=0.0)
+    results = [limiter.allow("ip", now=100.0)[0] for _ in range(3)]
+    assert results == [True, True, False]
+
+
+def test_keys_are_independent():
+    limiter = KeyedRateLimiter(rate=1.0, burst=1)
+    assert limiter.allow("a", now=0.0)[0]
+    assert not limiter.allow("a", now=0.0)[0]
+    assert limiter.allow("b", now=0.0)[0]
+
+
+def test_zero_rate_disables():
+    limiter = KeyedRateLimiter(rate=0, burst=1)
+    assert all(limiter.allow("ip", now=0.0)[0] for _ in range(100))
+
+
+def test_lru_bound_evicts_oldest_key():
+    limiter = KeyedRateLimiter(rate=1.0, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.allow(key, now=0.0)
+    # "a" was evicted, so it starts again with a full bucket
+    assert limiter.allow("a", now=0.0)[0]
+    assert not limiter.allow("c", now=0.0)[0]
+
+
+def test_in_flight_cap():
+    admission = AdmissionController(max_in_flight=2)
+    assert admission.try_enter() and admission.try_enter()
+    assert not admission.try_enter()
+    admission.leave()
+    assert admission.try_enter()
+
+
+def _post_status(port: int, forwarded: str) -> int:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/register", data=b"{}", headers={"X-Forwarded-For": forwarded}
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_spoofed_forwarded_entries_share_one_ip_bucket():
+    admission = AdmissionController(ip_rate=0.01, ip_burst=1, email_rate=0)
+    server = make_server(port=0, admission=admission, store_path=None, trusted_proxies=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        port = server.server_address[1]
+        # the leftmost entries are client-chosen; the proxy-appended one is what counts
+        statuses = [_post_status(port, f"10.0.0.{i}, 203.0.113.7") for i in range(3)]
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert statuses == [422, 429, 429]
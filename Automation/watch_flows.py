@@ -0,0 +1,178 @@
+"""
+Watch mode: re-run only the automation steps affected by a front-end change.
+
+Keeps one headless Chrome open, polls index.html, script.js, data.js and
+index.css, and when one changes soft-reloads the page and re-runs just the
+flows/steps that exercise that file:
+
+  data.js     -> Flow C steps country_state, state_city; the positive and
+                 negative flows (they pick IN / Telangana / Hyderabad)
+  index.css   -> Flow C steps password_strength, confirm_error (styled states
+                 captured in screenshots)
+  script.js   -> every flow
+  index.html  -> every flow
+
+Flow C steps pull in the earlier steps they depend on for page state (see
+form_logic_validation.STEP_REQUIRES). Instead of the fixed post-load sleeps the
+reload waits until the page has populated #country.
+
+Usage:
+    python watch_flows.py              # headless, wait for changes
+    python watch_flows.py --initial    # run everything once first
+    python watch_flows.py --headed     # watch the browser work
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+import form_logic_validation
+import test_negative_flow
+import test_positive_flow
+from driver_resolver import resolve_chromedriver
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INDEX_URL = "file://" + os.path.join(ROOT, "index.html")
+
+ALL_STEPS = None  # run the whole flow
+
+# watched file -> [(flow name, steps or ALL_STEPS)]
+AFFECTED: Dict[str, List[Tuple[str, Optional[Tuple[str, ...]]]]] = {
+    "data.js": [("form_logic", ("country_state", "state_city")), ("positive", ALL_STEPS), ("negative", ALL_STEPS)],
+    "index.css": [("form_logic", ("password_strength", "confirm_error"))],
+    "script.js": [("form_logic", ALL_STEPS), ("positive", ALL_STEPS), ("negative", ALL_STEPS)],
+    "index.html": [("form_logic", ALL_STEPS), ("positive", ALL_STEPS), ("negative", ALL_STEPS)],
+}
+FLOW_ORDER = ("form_logic", "positive", "negative")
+
+# Flow C step -> summary flag it sets
+STEP_FLAGS = {
+    "country_state": "states_updated",
+    "state_city": "cities_updated",
+    "password_strength": "pwd_meter_changed",
+    "confirm_error": "confirm_error_shown",
+    "submit_state": "submit_disabled_until_valid",
+}
+
+
+def snapshot_mtimes() -> Dict[str, int]:
+    """Current mtime (ns) of every watched file; missing files map to 0."""
+    mtimes = {}
+    for name in AFFECTED:
+        try:
+            mtimes[name] = os.stat(os.path.join(ROOT, name)).st_mtime_ns
+        except OSError:
+            mtimes[name] = 0
+    return mtimes
+
+
+def plan(changed: List[str]) -> Dict[str, Optional[set]]:
+    """Merge the affected flows/steps of all changed files (None = whole flow)."""
+    flows: Dict[str, Optional[set]] = {}
+    for name in changed:
+        for flow, steps in AFFECTED.get(name, []):
+            if steps is ALL_STEPS or (flow in flows and flows[flow] is None):
+                flows[flow] = None
+            else:
+                flows.setdefault(flow, set()).update(steps)
+    return {flow: flows[flow] for flow in FLOW_ORDER if flow in flows}
+
+
+def soft_reload(driver, timeout: float = 5.0) -> bool:
+    """Reload the page in the open browser and wait until the form is populated and empty."""
+    # a fresh navigation rather than refresh(): Chrome may restore typed values on reload
+    driver.get(INDEX_URL)
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script(
+                "return document.readyState === 'complete' && "
+                "!!document.querySelector('#country') && "
+                "document.querySelector('#country').options.length > 1;"
+            )
+        )
+    except TimeoutException:
+        print("Page did not finish populating within", timeout, "s")
+        return False
+    # the reused flows type with send_keys() and expect empty fields
+    driver.execute_script("document.getElementById('regForm').reset();")
+    return True
+
+
+def run_flow(driver, flow: str, steps: Optional[set]) -> None:
+    """Run one flow (or the selected Flow C steps) on a freshly reloaded page."""
+    if not soft_reload(driver):
+        return
+    started = time.perf_counter()
+    if flow == "form_logic":
+        names = form_logic_validation.resolve_steps(steps or form_logic_validation.STEPS)
+        print(f"[form_logic] steps: {', '.join(names)}")
+        summary = form_logic_validation.run_steps(driver, form_logic_validation.new_summary(), names)
+        for name in names:
+            print(f" - {STEP_FLAGS[name]}: {summary[STEP_FLAGS[name]]}")
+    elif flow == "positive":
+        print("[positive] result:", "PASS" if test_positive_flow.run_flow(driver) else "FAIL")
+    elif flow == "negative":
+        print("[negative] lastName error shown:", test_negative_flow.run_flow(driver))
+    print(f"[{flow}] done in {time.perf_counter() - started:.2f}s")
+
+
+def run_plan(driver, flows: Dict[str, Optional[set]]) -> None:
+    """Run every planned flow, reporting failures without stopping the watcher."""
+    for flow, steps in flows.items():
+        try:
+            run_flow(driver, flow, steps)
+        except WebDriverException as e:
+            print(f"[{flow}] WebDriver error: {type(e).__name__}: {e.msg}")
+        except Exception as e:
+            print(f"[{flow}] failed: {type(e).__name__}: {e}")
+
+
+def main() -> None:
+    """Open a warm browser and re-run affected flows whenever a watched file changes."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", type=float, default=0.3, help="polling interval in seconds")
+    parser.add_argument("--debounce", type=float, default=0.2, help="wait for editors to finish writing")
+    parser.add_argument("--initial", action="store_true", help="run every flow once at startup")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    args = parser.parse_args()
+
+    opts = Options()
+    opts.add_argument("--window-size=1200,900")
+    if not args.headed:
+        opts.add_argument("--headless=new")
+    driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=opts)
+
+    try:
+        driver.get(INDEX_URL)
+        if args.initial:
+            run_plan(driver, plan(["index.html"]))
+
+        mtimes = snapshot_mtimes()
+        print("Watching", ", ".join(sorted(AFFECTED)), "in", ROOT, "(Ctrl+C to stop)")
+        while True:
+            time.sleep(args.interval)
+            current = snapshot_mtimes()
+            if current == mtimes:
+                continue
+            # let multi-file saves settle, then take the final picture
+            time.sleep(args.debounce)
+            current = snapshot_mtimes()
+            changed = [name for name in AFFECTED if current[name] != mtimes[name]]
+            mtimes = current
+            print(f"\nChanged: {', '.join(changed)}")
+            run_plan(driver, plan(changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
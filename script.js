@@ -12,10 +12,27 @@ function setTopAlert(text, type){
   topAlert.style.display = text ? 'block' : 'none';
 }
 
+// true if the select already holds the placeholder + exactly these [value, label] options
+function optionsMatch(select, options){
+  const opts = select.options;
+  if(opts.length !== options.length + 1) return false;
+  for(let i = 0; i < options.length; i++){
+    const opt = opts[i + 1];
+    if(opt.value !== options[i][0] || opt.textContent !== options[i][1]) return false;
+  }
+  return true;
+}
+
 // populate countries and phone codes
 function populateCountries(){
   const country = $('country');
   const phoneCode = $('phoneCode');
+  // options pre-rendered by the build step (or built earlier) only need resetting
+  if(optionsMatch(country, DATA.countries.map(c=>[c.code, c.name])) &&
+     optionsMatch(phoneCode, DATA.countries.map(c=>[c.phoneCode, `${c.name} (${c.phoneCode})`]))){
+    country.value = ''; phoneCode.value = '';
+    return;
+  }
   country.innerHTML = '<option value="">-- Select Country --</option>';
   phoneCode.innerHTML = '<option value="">-- Select Code --</option>';
   DATA.countries.forEach(c=>{